@@ -87,6 +87,8 @@ sentry_sdk.init(
 
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 5 * 1024 * 1024  # 5 MB — prevent memory exhaustion from oversized payloads
+# TESTING=true (tests/conftest.py) → Flask testing mode from the first line of app.py on
+app.config["TESTING"] = os.environ.get("TESTING", "false").lower() in ("true", "1", "yes")
 Compress(app)  # gzip all responses >500 bytes — cuts dashboard from 411KB to ~80KB
 
 
@@ -305,6 +307,10 @@ def _safe_int(val, default: int, min_v: int | None = None, max_v: int | None = N
 
 
 # ── XGBoost direction model (caricato una volta all'avvio) ────────────────────
+# SKIP_MODEL_LOAD=true → avvio senza modelli XGBoost (test/smoke: tests/conftest.py):
+# /predict-xgb risponde agree=True (model_not_loaded), i gate XGB vengono saltati.
+# /force-retrain li ricarica comunque.
+SKIP_MODEL_LOAD = os.environ.get("SKIP_MODEL_LOAD", "false").lower() in ("true", "1", "yes")
 _XGB_MODEL = None
 _XGB_CLEAN_BET_COUNT: int | None = None   # cache count bet pulite (post-Day0)
 _XGB_CLEAN_BET_CHECKED_AT: float = 0.0   # timestamp ultimo check
@@ -330,7 +336,10 @@ def _load_xgb_model():
     else:
         app.logger.warning(f"[XGB] Model not found at {model_path} — /predict-xgb will return agree=True")
 
-_load_xgb_model()
+if SKIP_MODEL_LOAD:
+    app.logger.info("[XGB] SKIP_MODEL_LOAD — direction model not loaded")
+else:
+    _load_xgb_model()
 
 # Regime labels (per /btc-regime e logging)
 _REGIME_LABELS = {0: "RANGING", 1: "TRENDING", 2: "VOLATILE"}
@@ -503,15 +512,73 @@ def _compute_micro_regime_1h() -> dict:
 
 
 # ── XGBoost correctness model (caricato una volta all'avvio) ─────────────────
-_xgb_correctness = None
-try:
-    _corr_path = os.path.join(os.path.dirname(__file__), "models", "xgb_correctness.pkl")
-    _xgb_correctness = joblib_load(_corr_path)
+# XGB_ONNX=true → serve models/xgb_correctness.int8.onnx (scripts/quantize_models.py)
+# via onnxruntime; fallback automatico al .pkl FP32 se manca file o libreria.
+XGB_ONNX = os.environ.get("XGB_ONNX", "false").lower() == "true"
+
+
+class _OnnxProba:
+    """predict_proba() su una InferenceSession ONNX — drop-in per XGBClassifier."""
+
+    def __init__(self, path):
+        import numpy as np
+        import onnxruntime as ort
+        self._np = np
+        self._sess = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self._input = self._sess.get_inputs()[0].name
+        self._proba = self._sess.get_outputs()[1].name
+        self.n_features_in_ = self._sess.get_inputs()[0].shape[1]
+
+    def predict_proba(self, X):
+        X = self._np.asarray(X, dtype=self._np.float32)
+        return self._sess.run([self._proba], {self._input: X})[0]
+
+
+def _load_correctness_model():
+    models_dir = os.path.join(os.path.dirname(__file__), "models")
+    if XGB_ONNX:
+        try:
+            model = _OnnxProba(os.path.join(models_dir, "xgb_correctness.int8.onnx"))
+            logging.getLogger(__name__).info("[XGB] Correctness model loaded (INT8 ONNX)")
+            return model
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"[XGB] INT8 ONNX correctness model unavailable ({e}) — using pkl")
+    model = joblib_load(os.path.join(models_dir, "xgb_correctness.pkl"))
     from xgboost import XGBClassifier
-    assert isinstance(_xgb_correctness, XGBClassifier), "Correctness model type mismatch"
+    assert isinstance(model, XGBClassifier), "Correctness model type mismatch"
     logging.getLogger(__name__).info("[XGB] Correctness model loaded")
-except Exception as _e:
-    logging.getLogger(__name__).warning(f"[XGB] Correctness model NOT loaded: {_e}")
+    return model
+
+
+def _load_correctness_platt():
+    """(a, b) Platt da models/model_metadata.json (train_xgboost.fit_platt), None se assente."""
+    meta_path = os.path.join(os.path.dirname(__file__), "models", "model_metadata.json")
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            platt = json.load(f).get("correctness_platt")
+        return (float(platt["a"]), float(platt["b"])) if platt else None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _calibrate_correctness(p_raw: float) -> float:
+    """P(CORRECT) raw → Platt-calibrata; identità se non c'è calibrazione."""
+    platt = _CORR_PLATT
+    if platt is None:
+        return p_raw
+    p = min(max(p_raw, 1e-6), 1 - 1e-6)
+    z = platt[0] * math.log(p / (1 - p)) + platt[1]
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+_xgb_correctness = None
+_CORR_PLATT = None
+if not SKIP_MODEL_LOAD:
+    try:
+        _xgb_correctness = _load_correctness_model()
+        _CORR_PLATT = _load_correctness_platt()
+    except Exception as _e:
+        logging.getLogger(__name__).warning(f"[XGB] Correctness model NOT loaded: {_e}")
 
 # ── Adaptive Calibration Engine (ACE) ────────────────────────────────────────
 from adaptive_engine import AdaptiveEngine
@@ -4172,6 +4239,7 @@ def bet_sizing():
 
         # P1.1 — XGBoost correctness penalty
         corr_prob = None
+        corr_prob_raw = None
         corr_multiplier = 1.0
         if _xgb_correctness is not None:
             try:
@@ -4191,7 +4259,8 @@ def bet_sizing():
                 _corr_raw = _xgb_correctness.predict_proba(feat_row)[0]
                 if len(_corr_raw) < 2:
                     raise ValueError(f"correctness model returned shape {len(_corr_raw)}")
-                corr_prob = float(_corr_raw[1])  # P(CORRECT)
+                corr_prob_raw = float(_corr_raw[1])  # P(CORRECT) raw XGB
+                corr_prob = _calibrate_correctness(corr_prob_raw)  # Platt — soglie su questa
                 # Se P(CORRECT) < 0.45: size -20%, se > 0.55: size +10%, altrimenti invariata
                 if corr_prob < 0.45:
                     corr_multiplier = 0.80
@@ -4219,6 +4288,7 @@ def bet_sizing():
             "confidence_used": confidence,
             "profit_factor": profit_factor,
             "xgb_correctness_prob": round(corr_prob, 4) if corr_prob is not None else None,
+            "xgb_correctness_prob_raw": round(corr_prob_raw, 4) if corr_prob_raw is not None else None,
             "xgb_multiplier": corr_multiplier,
             "calibrated_wr_estimate": calibrated_wr,
             "calibration_note": "historical WR for this confidence bucket",
@@ -5057,16 +5127,26 @@ def auto_retrain():
             if r2.returncode != 0:
                 app.logger.error(f"[RETRAIN] train_xgboost failed: {r2.stderr[-500:]}")
                 return
+            if XGB_ONNX:
+                # Non bloccante: se la quantizzazione fallisce il reload usa il .pkl
+                r2q = subprocess.run(
+                    ["python3", "scripts/quantize_models.py"],
+                    cwd=base, capture_output=True, text=True, timeout=120,
+                )
+                if r2q.returncode != 0:
+                    app.logger.warning(f"[RETRAIN] quantize_models failed: {(r2q.stdout + r2q.stderr)[-500:]}")
 
             # Step 3: hot-reload models in memory
             app.logger.info("[RETRAIN] Step 3/3: hot-reloading models...")
             _load_xgb_model()
-            global _xgb_correctness
+            global _xgb_correctness, _CORR_PLATT
             corr_path = os.path.join(base, "models", "xgb_correctness.pkl")
             if os.path.exists(corr_path):
-                temp_corr = joblib_load(corr_path)
+                temp_corr = _load_correctness_model()
+                temp_platt = _load_correctness_platt()
                 with _model_lock:
                     _xgb_correctness = temp_corr
+                    _CORR_PLATT = temp_platt
 
             # Refresh calibration thresholds
             refresh_calibration()
@@ -5,6 +5,10 @@ LOG="/tmp/btcbot_retrain_$(date +%Y%m%d).log"
 echo "[$(date)] Starting XGBoost retrain pipeline" >> $LOG
 /usr/bin/python3 build_dataset.py >> $LOG 2>&1
 /usr/bin/python3 train_xgboost.py >> $LOG 2>&1
+# INT8 ONNX export only when app.py serves it (XGB_ONNX=true, as in auto_retrain)
+if [ "$(echo "${XGB_ONNX:-false}" | tr '[:upper:]' '[:lower:]')" = "true" ]; then
+  /usr/bin/python3 scripts/quantize_models.py >> $LOG 2>&1 || echo "[$(date)] INT8 quantization failed — pkl models still live" >> $LOG
+fi
 # Reload calibration on Railway
 curl -s -X POST https://web-production-e27d0.up.railway.app/reload-calibration \
   -H "X-API-Key: REDACTED_BOT_API_KEY" \
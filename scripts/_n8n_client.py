@@ -0,0 +1,196 @@
+"""Shared n8n API plumbing for the wf01B scripts (update_wf01b*.py, archived/patch_wf01b_*.py).
+
+.env, the API key and the keep-alive session are set up once per process
+(memoized), so scripts run back-to-back — or together via patch_wf01b_all.py —
+reuse the same config and TLS connection.
+
+Fetched workflows are cached in ~/.cache/n8n/workflows/ with their ETag:
+re-runs send If-None-Match and reuse the cached body on a 304.
+"""
+import functools, io, json, os, certifi, requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # compact UTF-8 bytes
+except ImportError:
+    _json_loads = json.loads
+    _compact = json.JSONEncoder(separators=(',', ':'))
+
+    def _json_dumps(obj):
+        """Compact UTF-8 bytes, encoded chunk by chunk — no full-size str copy of the workflow."""
+        buf = io.BytesIO()
+        for chunk in _compact.iterencode(obj):
+            buf.write(chunk.encode())
+        return buf.getvalue()
+
+try:
+    import ijson  # optional: pull one key out of an echoed workflow without building it
+except ImportError:
+    ijson = None
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'n8n', 'workflows')
+
+ALLOWED_SETTINGS = frozenset({'executionOrder', 'saveManualExecutions', 'callerPolicy',
+                              'errorWorkflow', 'timezone', 'saveExecutionProgress'})
+
+
+@functools.lru_cache(maxsize=1)
+def _env():
+    """→ (host, api_key), read once."""
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+    return os.environ['N8N_HOST'], os.environ['N8N_API_KEY']
+
+
+def host():
+    return _env()[0]
+
+
+@functools.lru_cache(maxsize=1)
+def session():
+    """One keep-alive session: GET/PUT/POST reuse the same TLS connection.
+
+    Calls pass (connect, read) timeouts: an unreachable host fails in 5 s.
+    """
+    s = requests.Session()
+    s.verify = certifi.where()
+    s.headers['X-N8N-API-KEY'] = _env()[1]
+    s.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    return s
+
+
+def _url(wf_id, action=''):
+    return f'https://{host()}/api/v1/workflows/{wf_id}{action}'
+
+
+def _error_snippet(resp, limit=500):
+    """First `limit` bytes of an error body — resp.text would charset-sniff and decode all of it."""
+    return resp.content[:limit].decode('utf-8', errors='replace')
+
+
+def _top_level(resp, key, default=None):
+    """One top-level key of a JSON response body.
+
+    PUT and /activate echo the whole workflow back; with ijson only `key` is
+    materialized, otherwise the body is parsed as usual.
+    """
+    if ijson is not None:
+        try:
+            return next(ijson.items(io.BytesIO(resp.content), key), default)
+        except ijson.JSONError:
+            return default
+    return _json_loads(resp.content).get(key, default)
+
+
+def _cache_path(wf_id):
+    return os.path.join(CACHE_DIR, f'{wf_id}.json')
+
+
+def _cache_get(wf_id):
+    try:
+        with open(_cache_path(wf_id), 'rb') as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_put(wf_id, entry):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = _cache_path(wf_id) + '.tmp'
+        # 0600: the workflow body carries the API keys of its HTTP nodes
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as f:
+            f.write(_json_dumps(entry))
+        os.replace(tmp, _cache_path(wf_id))  # atomic: a concurrent run never reads half a file
+    except OSError as e:
+        print(f"  [WARN] workflow cache write failed: {e}")
+
+
+def _cache_drop(wf_id):
+    try:
+        os.remove(_cache_path(wf_id))
+    except OSError:
+        pass
+
+
+def fetch(wf_id):
+    """GET the workflow, conditional on the cached ETag — unchanged upstream = 304, no body."""
+    cached = _cache_get(wf_id)
+    headers = {'If-None-Match': cached['etag']} if cached and cached.get('etag') else {}
+    resp = session().get(_url(wf_id), headers=headers, timeout=(5, 15))
+    if resp.status_code == 304 and cached:
+        print(f"  Using cached {wf_id} (updatedAt {cached.get('updatedAt', '?')})")
+        return cached['body']
+    resp.raise_for_status()
+    data = _json_loads(resp.content)  # bytes straight in, no .text decode pass
+    if resp.headers.get('ETag'):
+        _cache_put(wf_id, {'etag': resp.headers['ETag'], 'updatedAt': data.get('updatedAt'), 'body': data})
+    else:
+        _cache_drop(wf_id)
+    return data
+
+
+def save(wf_id, data):
+    """PUT the workflow back (n8n rejects unknown settings keys). Returns True if saved."""
+    # iterate the workflow's own settings (not the set) so the payload key order is stable
+    settings = {k: v for k, v in (data.get('settings') or {}).items() if k in ALLOWED_SETTINGS}
+    payload = _json_dumps({
+        'name': data['name'],
+        'nodes': data['nodes'],
+        'connections': data['connections'],
+        'settings': settings,
+    })  # compact — no whitespace on the wire
+    print(f"Payload: {len(payload)} bytes")
+
+    resp = session().put(_url(wf_id), data=payload,
+                         headers={'Content-Type': 'application/json'}, timeout=(5, 30))
+    if resp.ok:
+        _cache_drop(wf_id)  # the cached ETag now describes the old version
+        print(f"\nSAVED! Updated: {_top_level(resp, 'updatedAt', '?')}")
+        return True
+    print(f"Error {resp.status_code}: {_error_snippet(resp)}")
+    return False
+
+
+def activate(wf_id):
+    """POST /activate → True if n8n reports the workflow active."""
+    resp = session().post(_url(wf_id, '/activate'),
+                          headers={'Content-Type': 'application/json'}, timeout=(5, 15))
+    if not resp.ok:
+        print(f"  Error {resp.status_code}: {_error_snippet(resp)}")
+        return False
+    active = _top_level(resp, 'active', False)
+    print(f"  active: {active}")
+    return active
+
+
+def edit_workflow(wf_id, edits):
+    """Fetch wf_id once, apply edits in one pass over its nodes, PUT once if anything changed.
+
+    edits maps node name -> fn(node) returning a change description, or None
+    if that node needed nothing. Returns the changes (empty = nothing was sent).
+    """
+    data = fetch(wf_id)
+    pending = dict(edits)
+    changes = []
+    for node in data.get('nodes', []):
+        edit = pending.pop(node.get('name'), None)
+        if edit is not None:
+            change = edit(node)
+            if change:
+                changes.append(change)
+            if not pending:
+                break
+    for name in pending:
+        print(f"  WARNING: node '{name}' not found")
+
+    if not changes:
+        print("No changes needed!")
+        return changes
+    for c in changes:
+        print(f"  {c}")
+    if not save(wf_id, data):
+        return []
+    return changes
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Patch wf01B: confidence recalibrator + gate fixes in ONE GET + ONE PUT.
+
+Applies apply_confidence, apply_flow and apply_gate (see the single-patch
+scripts, which stay runnable on their own) to one fetched copy of the
+workflow and saves it once, then reactivates wf08 like patch_wf01b_flow.py.
+
+HTTP, config and the ETag workflow cache live in scripts/_n8n_client.py.
+"""
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # scripts/_n8n_client.py
+import _n8n_client
+
+WF_ID = 'OMgFa9Min4qXRnhq'    # 01B_BTC_Prediction_Bot
+WF08_ID = 'Fjk7M3cOEcL1aAVf'  # 08 Position Monitor
+
+
+def run(patches):
+    """Fetch wf01B once, apply every patch fn in order, PUT once if anything changed.
+
+    Each patch is fn(data) -> list of change descriptions, mutating data in place.
+    Returns the combined changes (empty = nothing was sent).
+    """
+    data = _n8n_client.fetch(WF_ID)
+
+    changes = []
+    for patch in patches:
+        changes += patch(data)
+
+    if not changes:
+        print("No changes needed!")
+        return changes
+    for c in changes:
+        print(f"  {c}")
+    if not _n8n_client.save(WF_ID, data):
+        return []
+    return changes
+
+
+def main():
+    from patch_wf01b_confidence import apply_confidence
+    from patch_wf01b_flow import apply_flow
+    from patch_wf01b_gate import apply_gate, GateNotFound
+
+    try:
+        changes = run([apply_confidence, apply_flow, apply_gate])
+    except GateNotFound as e:
+        print(f"ERROR: {e} — nothing saved")
+        sys.exit(1)
+
+    print("\n=== Reactivating wf08 (Position Monitor) ===")
+    if _n8n_client.activate(WF08_ID):
+        changes.append("wf08 Position Monitor: REACTIVATED")
+    else:
+        print("  WARNING: wf08 not activated!")
+
+    print("\n=== Summary ===")
+    for c in changes:
+        print(f"  [OK] {c}")
+
+
+if __name__ == '__main__':
+    main()
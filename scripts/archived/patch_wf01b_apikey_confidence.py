@@ -16,32 +16,41 @@ Fix applied: 2 March 2026 ~08:10 UTC via n8n API
 """
 from dotenv import load_dotenv
 load_dotenv('/Users/mattiacalastri/btc_predictions/.env')
-import os, json, urllib.request, ssl, certifi
-
-ctx = ssl.create_default_context(cafile=certifi.where())
-api_key = os.environ['N8N_API_KEY']
-host = os.environ['N8N_HOST']
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # scripts/_n8n_client.py
+import _n8n_client
 
 OLD_KEY = os.environ.get('BOT_API_KEY_OLD', '')  # vecchia chiave da sostituire nei nodi n8n
 NEW_KEY = os.environ['BOT_API_KEY']  # chiave corrente — NEVER hardcode
 
 WF_ID = "OMgFa9Min4qXRnhq"  # 01B_BTC_Prediction_Bot
 
-url = f"https://{host}/api/v1/workflows/{WF_ID}"
-req = urllib.request.Request(url, headers={'X-N8N-API-KEY': api_key})
-wf = json.loads(urllib.request.urlopen(req, context=ctx).read())
+# Verified TLS (certifi) on one memoized keep-alive session: the PUT reuses the GET's connection
+wf = _n8n_client.fetch(WF_ID)
+
+
+def _replace_in_tree(obj, old, new):
+    """Replace old→new in every string leaf of a dict/list tree, in place. Returns # leaves changed."""
+    changed = 0
+    items = obj.items() if isinstance(obj, dict) else enumerate(obj)
+    for k, v in items:
+        if isinstance(v, str):
+            if old in v:
+                obj[k] = v.replace(old, new)
+                changed += 1
+        elif isinstance(v, (dict, list)):
+            changed += _replace_in_tree(v, old, new)
+    return changed
+
 
 fixes = []
 
 for node in wf.get('nodes', []):
     nname = node.get('name', '')
-    params = node.get('parameters', {})
-    params_str = json.dumps(params)
+    params = node.setdefault('parameters', {})
 
-    # Fix 1: Replace wrong API key
-    if OLD_KEY in params_str:
-        params_str = params_str.replace(OLD_KEY, NEW_KEY)
-        node['parameters'] = json.loads(params_str)
+    # Fix 1: Replace wrong API key (walk the params in place — no dumps/loads round-trip)
+    if OLD_KEY and _replace_in_tree(params, OLD_KEY, NEW_KEY):
         fixes.append(f"API key: {nname}")
 
     # Fix 2: Confidence source in Open Position
@@ -57,17 +66,8 @@ if not fixes:
     print("Nothing to fix — already patched")
     exit(0)
 
-payload = json.dumps({
-    "name": wf['name'],
-    "nodes": wf['nodes'],
-    "connections": wf['connections'],
-    "settings": {"executionOrder": wf.get('settings', {}).get('executionOrder', 'v1')}
-}).encode()
-
-update_req = urllib.request.Request(url, data=payload, headers={
-    'X-N8N-API-KEY': api_key, 'Content-Type': 'application/json'
-}, method='PUT')
-urllib.request.urlopen(update_req, context=ctx)
+if not _n8n_client.save(WF_ID, wf):
+    exit(1)
 
 print(f"Applied {len(fixes)} fixes:")
 for f in fixes:
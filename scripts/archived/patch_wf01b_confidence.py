@@ -1,19 +1,9 @@
 #!/usr/bin/env python3
-"""Patch wf01B: add confidence recalibrator + bump LLM temperature."""
-import ssl, urllib.request, json, os, certifi
-from dotenv import load_dotenv
-load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+"""Patch wf01B: add confidence recalibrator + bump LLM temperature.
 
-ctx = ssl.create_default_context(cafile=certifi.where())
-n8n_host = os.environ['N8N_HOST']
-n8n_key = os.environ['N8N_API_KEY']
-
-# Fetch workflow
-url = f'https://{n8n_host}/api/v1/workflows/OMgFa9Min4qXRnhq'
-req = urllib.request.Request(url, headers={'X-N8N-API-KEY': n8n_key})
-data = json.loads(urllib.request.urlopen(req, context=ctx, timeout=15).read())
-
-changes = []
+apply_confidence() is also run by patch_wf01b_all.py (one GET + one PUT for all wf01B patches).
+"""
+import sys
 
 # ── Patch 1: Add Confidence Recalibrator to Anti-Noise Filter ──
 RECALIBRATOR_CODE = r"""
@@ -69,66 +59,46 @@ if (confidence >= 0.54 && confidence <= 0.56 && direction && direction !== 'NO_B
 }
 """
 
-for node in data['nodes']:
-    if node.get('name') == 'Anti-Noise Filter':
-        code = node['parameters']['jsCode']
-
-        # Change const confidence to let confidence
-        if 'const confidence =' in code:
-            code = code.replace('const confidence =', 'let confidence =', 1)
-            changes.append("Anti-Noise: const confidence → let confidence")
-
-        # Insert recalibrator BEFORE the threshold logic
-        marker = "// ── M-3 v2: Dynamic Confidence Threshold"
-        if marker in code and 'CONFIDENCE RECALIBRATOR' not in code:
-            code = code.replace(marker, RECALIBRATOR_CODE + "\n" + marker)
-            changes.append("Anti-Noise: added confidence recalibrator")
-
-        node['parameters']['jsCode'] = code
-        break
-
-# ── Patch 2: Bump LLM temperature 0.15 → 0.30 ──
-for node in data['nodes']:
-    if node.get('name') == 'OpenRouter Chat Model':
-        opts = node['parameters'].get('options', {})
-        old_temp = opts.get('temperature', '?')
-        opts['temperature'] = 0.30
-        node['parameters']['options'] = opts
-        changes.append(f"LLM temperature: {old_temp} → 0.30")
-        break
-
-if not changes:
-    print("No changes needed!")
-    exit(1)
-
-for c in changes:
-    print(f"  {c}")
-
-# Save
-allowed_settings = {}
-for k in ('executionOrder', 'saveManualExecutions', 'callerPolicy',
-          'errorWorkflow', 'timezone', 'saveExecutionProgress'):
-    if k in data.get('settings', {}):
-        allowed_settings[k] = data['settings'][k]
-
-payload = json.dumps({
-    'name': data['name'],
-    'nodes': data['nodes'],
-    'connections': data['connections'],
-    'settings': allowed_settings,
-}).encode()
-
-print(f"Payload: {len(payload)} bytes")
-
-save_req = urllib.request.Request(
-    f'https://{n8n_host}/api/v1/workflows/OMgFa9Min4qXRnhq',
-    data=payload, method='PUT',
-    headers={'X-N8N-API-KEY': n8n_key, 'Content-Type': 'application/json'}
-)
-try:
-    resp = urllib.request.urlopen(save_req, context=ctx, timeout=30)
-    result = json.loads(resp.read())
-    print(f"\nSAVED! Updated: {result.get('updatedAt', '?')}")
-except urllib.error.HTTPError as e:
-    body = e.read().decode()
-    print(f"Error {e.code}: {body[:500]}")
+def apply_confidence(data):
+    """Recalibrator into Anti-Noise Filter + LLM temperature, in place → list of changes."""
+    changes = []
+
+    for node in data['nodes']:
+        if node.get('name') == 'Anti-Noise Filter':
+            code = node['parameters']['jsCode']
+
+            # Change const confidence to let confidence
+            if 'const confidence =' in code:
+                code = code.replace('const confidence =', 'let confidence =', 1)
+                changes.append("Anti-Noise: const confidence → let confidence")
+
+            # Insert recalibrator BEFORE the threshold logic
+            marker = "// ── M-3 v2: Dynamic Confidence Threshold"
+            if marker in code and 'CONFIDENCE RECALIBRATOR' not in code:
+                code = code.replace(marker, RECALIBRATOR_CODE + "\n" + marker)
+                changes.append("Anti-Noise: added confidence recalibrator")
+
+            node['parameters']['jsCode'] = code
+            break
+
+    # ── Patch 2: Bump LLM temperature 0.15 → 0.30 ──
+    for node in data['nodes']:
+        if node.get('name') == 'OpenRouter Chat Model':
+            opts = node['parameters'].get('options', {})
+            old_temp = opts.get('temperature', '?')
+            if old_temp != 0.30:  # already bumped → nothing to send
+                opts['temperature'] = 0.30
+                node['parameters']['options'] = opts
+                changes.append(f"LLM temperature: {old_temp} → 0.30")
+            break
+    return changes
+
+
+def main():
+    from patch_wf01b_all import run
+    if not run([apply_confidence]):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
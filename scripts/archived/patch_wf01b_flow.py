@@ -7,134 +7,114 @@ is AFTER this gate, so it never runs.
 
 Fix: Lower the gate to >= 0.50 so all signals reach the Anti-Noise Filter,
 which handles the real confidence-based filtering.
+
+apply_flow() is also run by patch_wf01b_all.py (one GET + one PUT for all wf01B patches).
 """
-import ssl, urllib.request, json, os, certifi
-from dotenv import load_dotenv
-load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
-
-ctx = ssl.create_default_context(cafile=certifi.where())
-n8n_host = os.environ['N8N_HOST']
-n8n_key = os.environ['N8N_API_KEY']
-
-# ── Patch 1: Fix "If Confidence > 62" gate in wf01B ──
-print("=== Patching wf01B confidence gate ===")
-url = f'https://{n8n_host}/api/v1/workflows/OMgFa9Min4qXRnhq'
-req = urllib.request.Request(url, headers={'X-N8N-API-KEY': n8n_key})
-data = json.loads(urllib.request.urlopen(req, context=ctx, timeout=15).read())
-
-changes = []
-
-for node in data['nodes']:
-    if node.get('name') == 'If Confidence > 62':
-        params = node.get('parameters', {})
-        conditions = params.get('conditions', {})
-
-        print(f"  Current node params: {json.dumps(params, indent=2)[:500]}")
-
-        # Find the condition that checks confidence > 0.62 and change it to >= 0.50
-        # n8n If nodes use various condition formats depending on version
-        found = False
-
-        # Check v2 format (combinator)
-        if 'options' in conditions:
-            for cond_group in conditions.get('options', {}).get('conditions', []):
-                for cond in cond_group.get('conditions', []):
-                    val = cond.get('rightValue')
-                    if val is not None and (val == 0.62 or val == '0.62' or str(val) == '0.62'):
-                        print(f"  Found threshold: {val} → changing to 0.50")
-                        cond['rightValue'] = 0.50
-                        # Also change operator from greaterThan to greaterThanOrEqual
-                        if cond.get('operator', {}).get('operation') == 'gt':
-                            cond['operator']['operation'] = 'gte'
-                        found = True
-
-        # Check v1 format (conditions.number)
-        if not found:
-            for num_cond in conditions.get('number', []):
-                val1 = num_cond.get('value1')
-                val2 = num_cond.get('value2')
-                op = num_cond.get('operation')
-                if val2 is not None and (float(val2) == 0.62 or float(val2) == 62):
-                    print(f"  Found v1 threshold: {val2} → changing to 0.50")
-                    num_cond['value2'] = 0.50
-                    if op == 'larger':
-                        num_cond['operation'] = 'largerEqual'
-                    found = True
-
-        if not found:
-            # Brute-force: search for 0.62 or 62 in the serialized params and replace
-            params_str = json.dumps(params)
-            if '0.62' in params_str:
-                params_str = params_str.replace('0.62', '0.50')
-                node['parameters'] = json.loads(params_str)
-                found = True
-                print("  Brute-force replaced 0.62 → 0.50 in params")
-            elif '"62"' in params_str or ': 62' in params_str:
-                params_str = params_str.replace('"62"', '"50"').replace(': 62', ': 50')
-                node['parameters'] = json.loads(params_str)
-                found = True
-                print("  Brute-force replaced 62 → 50 in params")
-
-        if found:
-            changes.append("If Confidence > 62: threshold lowered to >= 0.50")
-        else:
-            print(f"  WARNING: Could not find threshold to change!")
-            print(f"  Full params: {json.dumps(params, indent=2)}")
-        break
-
-if not changes:
-    print("  WARNING: 'If Confidence > 62' node not found!")
-
-# Save wf01B
-if changes:
-    allowed_settings = {}
-    for k in ('executionOrder', 'saveManualExecutions', 'callerPolicy',
-              'errorWorkflow', 'timezone', 'saveExecutionProgress'):
-        if k in data.get('settings', {}):
-            allowed_settings[k] = data['settings'][k]
-
-    payload = json.dumps({
-        'name': data['name'],
-        'nodes': data['nodes'],
-        'connections': data['connections'],
-        'settings': allowed_settings,
-    }).encode()
-
-    save_req = urllib.request.Request(
-        f'https://{n8n_host}/api/v1/workflows/OMgFa9Min4qXRnhq',
-        data=payload, method='PUT',
-        headers={'X-N8N-API-KEY': n8n_key, 'Content-Type': 'application/json'}
-    )
+import json
+import re
+
+THRESHOLD_KEYS = ('rightValue', 'value2')  # v2 / v1 If-node comparison operand
+
+
+def _walk(obj, pred, fn):
+    """Call fn(container, key) for every scalar leaf of a dict/list tree where
+    pred(key, value) holds — edits in place. Returns the number of hits."""
+    hits = 0
+    items = obj.items() if isinstance(obj, dict) else enumerate(obj)
+    for k, v in items:
+        if isinstance(v, (dict, list)):
+            hits += _walk(v, pred, fn)
+        elif pred(k, v):
+            fn(obj, k)
+            hits += 1
+    return hits
+
+
+def _is_legacy_threshold(key, value):
+    if key not in THRESHOLD_KEYS or isinstance(value, bool):
+        return False
     try:
-        resp = urllib.request.urlopen(save_req, context=ctx, timeout=30)
-        result = json.loads(resp.read())
-        print(f"  wf01B SAVED! Updated: {result.get('updatedAt', '?')}")
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        print(f"  Error {e.code}: {body[:500]}")
-
-# ── Patch 2: Reactivate wf08 (Position Monitor) ──
-print("\n=== Reactivating wf08 (Position Monitor) ===")
-wf08_id = 'Fjk7M3cOEcL1aAVf'
-
-activate_req = urllib.request.Request(
-    f'https://{n8n_host}/api/v1/workflows/{wf08_id}/activate',
-    method='POST',
-    headers={'X-N8N-API-KEY': n8n_key, 'Content-Type': 'application/json'}
-)
-try:
-    resp = urllib.request.urlopen(activate_req, context=ctx, timeout=15)
-    result = json.loads(resp.read())
-    active = result.get('active', False)
-    print(f"  wf08 active: {active}")
-    if active:
+        return float(value) in (0.62, 62)
+    except (TypeError, ValueError):  # expressions like "={{ $json.x }}"
+        return False
+
+
+def _lower_threshold(cond, key):
+    """0.62 → 0.50 and strict → inclusive operator, on the condition dict holding key."""
+    print(f"  Found threshold: {cond[key]} → changing to 0.50")
+    cond[key] = 0.50
+    op = cond.get('operator')
+    if isinstance(op, dict) and op.get('operation') == 'gt':
+        op['operation'] = 'gte'
+    if cond.get('operation') == 'larger':
+        cond['operation'] = 'largerEqual'
+
+
+# 0.62 / 62 as a whole number inside an expression string — never 10.62, 162 or 0.625
+_LEGACY_THRESHOLD_RE = re.compile(r'(?<![\d.])(?:0\.62|62)(?![\d.])')
+
+
+def _has_legacy_literal(key, value):
+    return isinstance(value, str) and _LEGACY_THRESHOLD_RE.search(value) is not None
+
+
+def _rewrite_legacy_literal(container, key):
+    """0.62 → 0.50 and 62 → 50 (keeps the expression's scale), in one pass over the string."""
+    old = container[key]
+    container[key] = _LEGACY_THRESHOLD_RE.sub(lambda m: '0.50' if m.group() == '0.62' else '50', old)
+    print(f"  Expression threshold: {old[:80]} → {container[key][:80]}")
+
+
+def apply_flow(data):
+    """Lower the 'If Confidence > 62' threshold to >= 0.50, in place → list of changes."""
+    changes = []
+    for node in data['nodes']:
+        if node.get('name') == 'If Confidence > 62':
+            params = node.get('parameters', {})
+
+            print(f"  Current node params: {json.dumps(params, indent=2)[:500]}")
+
+            # Find the condition that checks confidence > 0.62 and change it to >= 0.50.
+            # n8n If nodes nest conditions differently per version (v2 combinator:
+            # conditions.options.conditions[].conditions[].rightValue, v1:
+            # conditions.number[].value2) — one walk over the params covers both,
+            # and only numeric threshold fields, so 10.62 or 162 are never touched.
+            found = _walk(params, _is_legacy_threshold, _lower_threshold) > 0
+            if not found:
+                # Last resort: the threshold is written into an expression string
+                found = _walk(params, _has_legacy_literal, _rewrite_legacy_literal) > 0
+
+            if found:
+                changes.append("If Confidence > 62: threshold lowered to >= 0.50")
+            else:
+                print(f"  WARNING: Could not find threshold to change!")
+                print(f"  Full params: {json.dumps(params, indent=2)}")
+            break
+    else:
+        print("  WARNING: 'If Confidence > 62' node not found!")
+    return changes
+
+
+def main():
+    from patch_wf01b_all import WF08_ID, run
+    import _n8n_client  # importable once patch_wf01b_all has put scripts/ on sys.path
+
+    # ── Patch 1: Fix "If Confidence > 62" gate in wf01B ──
+    print("=== Patching wf01B confidence gate ===")
+    changes = run([apply_flow])
+
+    # ── Patch 2: Reactivate wf08 (Position Monitor) ──
+    # Memoized session: the POST reuses the GET/PUT's warm TLS connection
+    print("\n=== Reactivating wf08 (Position Monitor) ===")
+    if _n8n_client.activate(WF08_ID):
         changes.append("wf08 Position Monitor: REACTIVATED")
     else:
         print("  WARNING: wf08 not activated!")
-except urllib.error.HTTPError as e:
-    body = e.read().decode()
-    print(f"  Error {e.code}: {body[:500]}")
 
-print(f"\n=== Summary ===")
-for c in changes:
-    print(f"  [OK] {c}")
+    print(f"\n=== Summary ===")
+    for c in changes:
+        print(f"  [OK] {c}")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,19 +20,41 @@ Reports:
 
 import os
 import sys
+import gzip
 import json
+import time
+import base64
+import shutil
+import hashlib
+import tempfile
+import functools
 import subprocess
-import ssl
-import urllib.request
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    from websockets.sync.client import connect as _ws_connect
+except ImportError:  # no DevTools client — convert_to_pdf spawns one Chrome per report
+    _ws_connect = None
 
 # ── Paths ────────────────────────────────────────────────────
 REPO = Path(__file__).resolve().parent.parent
 REPORTS_DIR = REPO / "reports"
 CSS_FILE = REPORTS_DIR / "report_style.css"
 ICLOUD_DIR = Path.home() / "Library/Mobile Documents/com~apple~CloudDocs" / "\U0001f916 BTC Predictor Bot" / "\U0001f4c4 Docs" / "\U0001f4cb System Audit"
+FETCH_CACHE_DIR = Path.home() / ".cache" / "btc_reports"
 
 # Chrome for Testing path
 CHROME = "/Applications/Google Chrome for Testing.app/Contents/MacOS/Google Chrome for Testing"
@@ -58,30 +80,82 @@ SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY") or os.environ.get("SUPABAS
 BOT_URL = os.environ.get("BOT_URL", "https://web-production-e27d0.up.railway.app")
 READ_API_KEY = os.environ.get("READ_API_KEY", "")
 
-# ── SSL ──────────────────────────────────────────────────────
-try:
-    import certifi
-    SSL_CTX = ssl.create_default_context(cafile=certifi.where())
-except ImportError:
-    SSL_CTX = ssl.create_default_context()
+# ── HTTP session (keep-alive, one TLS handshake per host) ────
+def _build_session():
+    """Create a requests.Session with connection pooling + light retry."""
+    s = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    try:
+        import certifi
+        s.verify = certifi.where()
+    except ImportError:
+        pass
+    return s
+
+_SESSION = _build_session()
+
+# Disk cache for raw responses while iterating on HTML/CSS. Seconds, 0 = off;
+# set by --cache-ttl, never enabled by default.
+FETCH_CACHE_TTL = 0
 
 
 # ═══════════════════════════════════════════════════════════════
 #  DATA FETCHING
 # ═══════════════════════════════════════════════════════════════
+def _disk_cache_path(url):
+    return FETCH_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+
+def _disk_cache_get(url, ttl):
+    """Return cached raw body for url if younger than ttl seconds, else None."""
+    path = _disk_cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return path.read_bytes()
+    except OSError:
+        pass
+    return None
+
+
+def _disk_cache_put(url, body):
+    try:
+        FETCH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _disk_cache_path(url).write_bytes(body)
+    except OSError as e:
+        print(f"  [WARN] cache write failed: {e}")
+
+
 def _fetch_json(url, headers=None, timeout=15):
-    """GET JSON from URL."""
-    req = urllib.request.Request(url, headers=headers or {})
+    """GET JSON from URL (served from the disk cache when FETCH_CACHE_TTL > 0)."""
+    if FETCH_CACHE_TTL > 0:
+        cached = _disk_cache_get(url, FETCH_CACHE_TTL)
+        if cached is not None:
+            return _json_loads(cached)
     try:
-        with urllib.request.urlopen(req, timeout=timeout, context=SSL_CTX) as resp:
-            return json.loads(resp.read().decode())
+        resp = _SESSION.get(url, headers=headers or {}, timeout=timeout)
+        resp.raise_for_status()
+        data = _json_loads(resp.content)  # bytes straight in, no .text decode pass
+        if FETCH_CACHE_TTL > 0:
+            _disk_cache_put(url, resp.content)
+        return data
     except Exception as e:
         print(f"  [WARN] fetch {url[:80]}... -> {e}")
         return None
 
 
+# Columns read by compute_analytics / render_report_3 — keep in sync when adding fields
+BET_COLUMNS = ",".join([
+    "pnl_usd", "status", "direction", "confidence", "model_confidence", "created_at",
+    "entry_price", "exit_price", "signal_price", "ghost_correct",
+])
+
+
+@functools.lru_cache(maxsize=32)
 def fetch_supabase(table="btc_predictions", params="order=created_at.desc&limit=2000"):
-    """Fetch rows from Supabase REST API."""
+    """Fetch rows from Supabase REST API (memoized per run — treat result as read-only)."""
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("  [WARN] SUPABASE_URL/KEY not set")
         return []
@@ -93,8 +167,9 @@ def fetch_supabase(table="btc_predictions", params="order=created_at.desc&limit=
     return data if isinstance(data, list) else []
 
 
+@functools.lru_cache(maxsize=32)
 def fetch_bot(endpoint):
-    """Fetch from bot API."""
+    """Fetch from bot API (memoized per run — treat result as read-only)."""
     url = f"{BOT_URL}{endpoint}"
     headers = {}
     if READ_API_KEY:
@@ -102,20 +177,39 @@ def fetch_bot(endpoint):
     return _fetch_json(url, headers=headers)
 
 
-def fetch_all_data():
-    """Fetch all data needed for reports. Returns dict."""
+def _normalize_pnl(bets):
+    """Cast pnl_usd to float once (None stays None = not closed), in place.
+
+    Downstream analytics then read b["pnl_usd"] as a plain float on closed
+    bets instead of guarding every access with `or 0`. Idempotent, so it is
+    safe on the memoized Supabase list.
+    """
+    for b in bets:
+        p = b.get("pnl_usd")
+        b["pnl_usd"] = float(p) if p is not None else None
+    return bets
+
+
+def fetch_all_data(use_cache=True):
+    """Fetch all data needed for reports. Returns dict.
+
+    use_cache=False bypasses the per-run memo of fetch_bot/fetch_supabase.
+    """
     print("Fetching live data...")
+    bot = fetch_bot if use_cache else fetch_bot.__wrapped__
+    supabase = fetch_supabase if use_cache else fetch_supabase.__wrapped__
 
-    health = fetch_bot("/health") or {}
-    risk = fetch_bot("/risk-metrics") or {}
-    signals_resp = fetch_bot("/signals?limit=2000") or {}
-    equity_resp = fetch_bot("/equity-history") or {}
+    health = bot("/health") or {}
+    risk = bot("/risk-metrics") or {}
+    signals_resp = bot("/signals?limit=2000") or {}
+    equity_resp = bot("/equity-history") or {}
 
     signals = signals_resp.get("data", [])
     equity_history = equity_resp.get("history", [])
 
-    # Also fetch from Supabase directly for completeness
-    bets_raw = fetch_supabase("btc_predictions", "order=created_at.desc&limit=2000")
+    # Also fetch from Supabase directly for completeness (only the columns analytics read)
+    bets_raw = supabase("btc_predictions", f"select={BET_COLUMNS}&order=created_at.desc&limit=2000")
+    _normalize_pnl(bets_raw)
 
     print(f"  Health: v{health.get('version', '?')} | paused={health.get('paused')}")
     print(f"  Signals from API: {len(signals)}")
@@ -142,30 +236,31 @@ def compute_analytics(data):
     health = data["health"]
     risk = data["risk"]
 
-    # Filter closed bets (have pnl_usd)
-    closed = [b for b in bets if b.get("pnl_usd") is not None]
-    open_bets = [b for b in bets if b.get("pnl_usd") is None and b.get("status") != "ghost"]
+    # Filter closed bets (have pnl_usd — already a float, see _normalize_pnl)
+    closed = [b for b in bets if b["pnl_usd"] is not None]
+    open_bets = [b for b in bets if b["pnl_usd"] is None and b.get("status") != "ghost"]
     ghosts = [b for b in bets if b.get("status") == "ghost"]
 
     total = len(closed)
-    wins = sum(1 for b in closed if (b.get("pnl_usd") or 0) > 0)
+    wins = sum(1 for b in closed if b["pnl_usd"] > 0)
     losses = total - wins
     wr = (wins / total * 100) if total > 0 else 0
 
     # Direction split
     up_bets = [b for b in closed if b.get("direction") == "UP"]
     down_bets = [b for b in closed if b.get("direction") == "DOWN"]
-    up_wins = sum(1 for b in up_bets if (b.get("pnl_usd") or 0) > 0)
-    down_wins = sum(1 for b in down_bets if (b.get("pnl_usd") or 0) > 0)
+    up_wins = sum(1 for b in up_bets if b["pnl_usd"] > 0)
+    down_wins = sum(1 for b in down_bets if b["pnl_usd"] > 0)
     up_wr = (up_wins / len(up_bets) * 100) if up_bets else 0
     down_wr = (down_wins / len(down_bets) * 100) if down_bets else 0
 
     # PnL
-    total_pnl = sum(b.get("pnl_usd", 0) or 0 for b in closed)
+    total_pnl = sum(b["pnl_usd"] for b in closed)
     avg_win = 0
     avg_loss = 0
-    winning = [b.get("pnl_usd", 0) for b in closed if (b.get("pnl_usd") or 0) > 0]
-    losing = [b.get("pnl_usd", 0) for b in closed if (b.get("pnl_usd") or 0) < 0]
+    pnls = [b["pnl_usd"] for b in closed]
+    winning = [p for p in pnls if p > 0]
+    losing = [p for p in pnls if p < 0]
     if winning:
         avg_win = sum(winning) / len(winning)
     if losing:
@@ -178,42 +273,35 @@ def compute_analytics(data):
     up_pct = (dir_counts.get("UP", 0) / total * 100) if total > 0 else 0
     down_pct = (dir_counts.get("DOWN", 0) / total * 100) if total > 0 else 0
 
-    # Hourly analysis
-    hourly_stats = defaultdict(lambda: {"total": 0, "wins": 0, "pnl": 0})
-    for b in closed:
-        try:
-            ts = b.get("created_at", "")
-            h = int(ts[11:13]) if len(ts) > 13 else 0
-        except (ValueError, IndexError):
-            h = 0
-        hourly_stats[h]["total"] += 1
-        hourly_stats[h]["pnl"] += b.get("pnl_usd", 0) or 0
-        if (b.get("pnl_usd") or 0) > 0:
-            hourly_stats[h]["wins"] += 1
+    # Hourly analysis — counts via Counter, one float accumulation pass for PnL
+    hours = [_utc_hour(b.get("created_at")) for b in closed]
+    hourly_total = Counter(hours)
+    hourly_wins = Counter(h for h, p in zip(hours, pnls) if p > 0)
+    hourly_pnl = defaultdict(float)
+    for h, p in zip(hours, pnls):
+        hourly_pnl[h] += p
+    hourly_stats = {
+        h: {"total": n, "wins": hourly_wins[h], "pnl": hourly_pnl[h]}
+        for h, n in hourly_total.items()
+    }
 
     # Confidence buckets
-    conf_buckets = defaultdict(lambda: {"total": 0, "wins": 0})
-    for b in closed:
-        c = b.get("confidence") or b.get("model_confidence") or 0
-        if c < 0.55:
-            bucket = "<55%"
-        elif c < 0.60:
-            bucket = "55-60%"
-        elif c < 0.65:
-            bucket = "60-65%"
-        elif c < 0.70:
-            bucket = "65-70%"
-        else:
-            bucket = "70%+"
-        conf_buckets[bucket]["total"] += 1
-        if (b.get("pnl_usd") or 0) > 0:
-            conf_buckets[bucket]["wins"] += 1
+    buckets = [_conf_bucket(b.get("confidence") or b.get("model_confidence") or 0) for b in closed]
+    bucket_total = Counter(buckets)
+    bucket_wins = Counter(k for k, p in zip(buckets, pnls) if p > 0)
+    conf_buckets = {k: {"total": n, "wins": bucket_wins[k]} for k, n in bucket_total.items()}
+    # Per-bucket (label, trades, wins, WR%) in display order, shared by reports 2 and 4
+    conf_table = [
+        (k, bucket_total[k], bucket_wins[k],
+         (bucket_wins[k] / bucket_total[k] * 100) if bucket_total[k] else 0)
+        for k in CONF_BUCKETS
+    ]
 
     # Streak
     streak_type = None
     streak_count = 0
     for b in sorted(closed, key=lambda x: x.get("created_at", ""), reverse=True):
-        is_win = (b.get("pnl_usd") or 0) > 0
+        is_win = b["pnl_usd"] > 0
         if streak_type is None:
             streak_type = is_win
             streak_count = 1
@@ -225,18 +313,18 @@ def compute_analytics(data):
     # Last N rolling WR
     last_10 = sorted(closed, key=lambda x: x.get("created_at", ""))[-10:]
     last_50 = sorted(closed, key=lambda x: x.get("created_at", ""))[-50:]
-    wr_10 = sum(1 for b in last_10 if (b.get("pnl_usd") or 0) > 0) / max(len(last_10), 1) * 100
-    wr_50 = sum(1 for b in last_50 if (b.get("pnl_usd") or 0) > 0) / max(len(last_50), 1) * 100
+    wr_10 = sum(1 for b in last_10 if b["pnl_usd"] > 0) / max(len(last_10), 1) * 100
+    wr_50 = sum(1 for b in last_50 if b["pnl_usd"] > 0) / max(len(last_50), 1) * 100
 
     # Direction of last 50
     last_50_dirs = Counter(b.get("direction") for b in last_50)
     down_pct_50 = last_50_dirs.get("DOWN", 0) / max(len(last_50), 1) * 100
 
-    # Equity drawdown
-    eq = data["equity_history"]
+    # Equity drawdown (sorted once, reused by the equity curve in report 2)
+    equity_sorted = sorted(data["equity_history"], key=lambda x: x.get("created_at", ""))
     max_eq = 0
     max_dd = 0
-    for pt in sorted(eq, key=lambda x: x.get("created_at", "")):
+    for pt in equity_sorted:
         e = pt.get("equity", 0) or 0
         if e > max_eq:
             max_eq = e
@@ -249,9 +337,11 @@ def compute_analytics(data):
     ghost_evaluated = sum(1 for g in ghosts if g.get("ghost_correct") is not None)
     ghost_wr = (ghost_correct / ghost_evaluated * 100) if ghost_evaluated > 0 else 0
 
-    # Recent bets (last 24h)
-    now = datetime.now(timezone.utc)
-    recent_24h = [b for b in closed if _parse_ts(b.get("created_at")) and (now - _parse_ts(b["created_at"])).total_seconds() < 86400]
+    # Recent bets (last 24h) — Supabase timestamps are UTC ISO 8601, which
+    # sort lexicographically, so compare the "YYYY-MM-DDTHH:MM:SS" prefix
+    # against one cutoff string instead of parsing every row.
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=24)).strftime("%Y-%m-%dT%H:%M:%S")
+    recent_24h_count = sum(1 for b in closed if (b.get("created_at") or "")[:19] > cutoff)
 
     return {
         "total": total,
@@ -273,35 +363,43 @@ def compute_analytics(data):
         "avg_win": avg_win,
         "avg_loss": avg_loss,
         "profit_factor": profit_factor,
-        "hourly_stats": dict(hourly_stats),
-        "conf_buckets": dict(conf_buckets),
+        "hourly_stats": hourly_stats,
+        "conf_buckets": conf_buckets,
+        "conf_table": conf_table,
         "streak_type": "WIN" if streak_type is True else ("LOSS" if streak_type is False else "N/A"),
         "streak_count": streak_count,
         "wr_10": wr_10,
         "wr_50": wr_50,
         "down_pct_50": down_pct_50,
         "max_drawdown": max_dd,
+        "equity_sorted": equity_sorted,
         "equity_final": data["equity_history"][-1].get("equity", 0) if data["equity_history"] else 0,
-        "recent_24h": len(recent_24h),
+        "recent_24h": recent_24h_count,
         "closed_bets_sorted": sorted(closed, key=lambda x: x.get("created_at", ""), reverse=True),
     }
 
 
-def _parse_ts(ts_str):
-    """Parse ISO timestamp string, return datetime or None."""
-    if not ts_str:
-        return None
+def _utc_hour(ts):
+    """Hour of an ISO timestamp string ("...THH:..."), 0 when missing/malformed."""
     try:
-        s = str(ts_str).strip()
-        # Handle Z suffix
-        if s.endswith("Z"):
-            s = s[:-1] + "+00:00"
-        # If no timezone info at all, assume UTC
-        if "+" not in s and s.count("-") <= 2:
-            s += "+00:00"
-        return datetime.fromisoformat(s)
-    except (ValueError, TypeError):
-        return None
+        return int(ts[11:13]) if ts and len(ts) > 13 else 0
+    except ValueError:
+        return 0
+
+
+CONF_BUCKETS = ("<55%", "55-60%", "60-65%", "65-70%", "70%+")
+
+
+def _conf_bucket(c):
+    if c < 0.55:
+        return "<55%"
+    elif c < 0.60:
+        return "55-60%"
+    elif c < 0.65:
+        return "60-65%"
+    elif c < 0.70:
+        return "65-70%"
+    return "70%+"
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -315,14 +413,7 @@ def _css():
     return CSS_FILE.read_text(encoding="utf-8")
 
 
-def _html_wrap(title, subtitle, meta_chips, body_html, generated_at):
-    """Wrap body in the standard HTML template."""
-    date_str = generated_at.strftime("%d %B %Y, %H:%M UTC")
-    chips_html = ""
-    for label, cls in meta_chips:
-        chips_html += f'<span class="meta-chip {cls}">{label}</span>\n'
-
-    return f"""<!DOCTYPE html>
+_PAGE_TMPL = """<!DOCTYPE html>
 <html lang="it">
 <head>
 <meta charset="UTF-8">
@@ -330,7 +421,7 @@ def _html_wrap(title, subtitle, meta_chips, body_html, generated_at):
 <title>{title}</title>
 <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&family=JetBrains+Mono:wght@400;600&display=swap" rel="stylesheet">
 <style>
-{_css()}
+{css}
 </style>
 </head>
 <body>
@@ -362,15 +453,46 @@ def _html_wrap(title, subtitle, meta_chips, body_html, generated_at):
 </html>"""
 
 
-def _kpi(value, label, cls="", sub=""):
-    sub_html = f'<div class="kpi-sub">{sub}</div>' if sub else ""
-    return f"""<div class="kpi-card">
+def _report_date(data):
+    """Header/footer date string — formatted once per run, cached on data."""
+    date_str = data.get("generated_at_str")
+    if date_str is None:
+        date_str = data["generated_at_str"] = data["generated_at"].strftime("%d %B %Y, %H:%M UTC")
+    return date_str
+
+
+def _html_wrap(title, subtitle, meta_chips, body_html, date_str):
+    """Wrap body in the standard HTML template."""
+    chips_html = "".join(
+        f'<span class="meta-chip {cls}">{label}</span>\n' for label, cls in meta_chips
+    )
+    return _PAGE_TMPL.format_map({
+        "title": title,
+        "subtitle": subtitle,
+        "date_str": date_str,
+        "chips_html": chips_html,
+        "body_html": body_html,
+        "css": _css(),
+    })
+
+
+_KPI_TMPL = """<div class="kpi-card">
   <div class="kpi-value {cls}">{value}</div>
   <div class="kpi-label">{label}</div>
   {sub_html}
 </div>"""
 
 
+def _kpi(value, label, cls="", sub=""):
+    sub_html = f'<div class="kpi-sub">{sub}</div>' if sub else ""
+    return _KPI_TMPL.format(value=value, label=label, cls=cls, sub_html=sub_html)
+
+
+def _kpi_grid(cards):
+    """Render (value, label, cls) triples as kpi-grid cards (no sub line)."""
+    return "\n    ".join(_KPI_TMPL.format(value=v, label=l, cls=c, sub_html="") for v, l, c in cards)
+
+
 def _score_bar(name, value, max_val=100, cls=""):
     pct = min(value / max_val * 100, 100) if max_val > 0 else 0
     return f"""<div class="score-bar-wrap">
@@ -387,16 +509,207 @@ def _alert(text, level="blue"):
 </div>"""
 
 
+# Lookup tuples so the row loops index a class directly instead of calling a helper:
+#   _WR_CLS[(wr >= 45) + (wr >= 55)]      -> red / yellow / green
+#   _PNL_CLS[(pnl > 0) - (pnl < 0)]       -> muted / up / down (index -1)
+_WR_CLS = ("red", "yellow", "green")
+_PNL_CLS = ("val-muted", "val-up", "val-down")
+
+
 def _wr_color(wr):
-    if wr >= 55:
-        return "green"
-    elif wr >= 45:
-        return "yellow"
-    return "red"
+    return _WR_CLS[(wr >= 45) + (wr >= 55)]
+
+
+# Row templates for the long tables — one format_map per row on a template
+# parsed once, instead of a fresh f-string evaluation per iteration.
+_EQUITY_BAR_TMPL = '<div class="equity-bar {cls}" style="height:{h_pct:.0f}%" title="${e:.2f}"></div>\n'
+
+_BET_ROW_TMPL = """<tr>
+  <td class="mono">{ts}</td>
+  <td class="center"><span class="{dir_cls}">{direction}</span></td>
+  <td class="center">{conf:.1%}</td>
+  <td class="right mono">${entry:,.2f}</td>
+  <td class="right mono">${exit_p:,.2f}</td>
+  <td class="right"><span class="{pnl_cls}">${pnl:+.4f}</span></td>
+  <td class="center">{status}</td>
+</tr>"""
+
+_HOURLY_ROW_TMPL = """<tr>
+  <td class="center">{h:02d}:00</td>
+  <td class="center">{t}</td>
+  <td class="center">{w}</td>
+  <td class="center"><span class="{wr_cls}">{wr:.0f}%</span></td>
+  <td class="right"><span class="{pnl_cls}">${pnl:+.4f}</span></td>
+</tr>"""
+
+
+# Static report sections — parsed and allocated once at import, the
+# render_report_* functions only format the parts that carry live values.
+_R4_ARCHITECTURE = """
+<section class="section">
+  <div class="section-title">Architecture Overview</div>
+  <div class="section-desc">Il flusso completo dal segnale all'esecuzione su Kraken Futures</div>
+  <div class="code-block">
+Signal Generation (n8n wf01A)
+  |
+  v
+place_bet() &rarr; Auth &rarr; Rate Limit &rarr; Parse &rarr; Direction
+  |
+  v
+Dead Hours Guard &rarr; XGB Gate &rarr; DOWN Kill Switch
+  |
+  v
+Pre-flight Checks &rarr; Slippage Guard &rarr; DRY_RUN Check
+  |
+  v
+Position Sizing (Kelly-derived) &rarr; create_order() &rarr; Kraken Futures
+  |
+  v
+On-chain Commit (Polygon PoS) &rarr; Supabase Log &rarr; Telegram Alert
+  |
+  v
+Ghost Verification (T+30m, wf08) &rarr; Auto-Retrain (03:00 UTC, wf10)
+  </div>
+</section>
+"""
+
+_R4_GHOST_HEAD = """
+</section>
+
+<section class="section">
+  <div class="section-title">Ghost Signal Verification</div>
+  <div class="section-desc">Segnali filtrati dal gate vengono comunque valutati a T+30min per misurare l'accuratezza latente</div>
+  <div class="card-panel">
+    <ul>
+      <li>Logica: exit price vs signal price a T+30min (Binance 1m kline)</li>
+      <li>Colonne Supabase: ghost_correct, ghost_entry_price, ghost_exit_price, ghost_pnl_usd</li>
+"""
+
+_R4_REGIME = """
+<section class="section">
+  <div class="section-title">Regime Detection</div>
+  <div class="card-panel">
+    <h3>Status: Planned (P1)</h3>
+    <p>I mercati alternano tra trend, ranging e volatile. Aggiungere una label di regime come feature XGBoost migliorerebbe la calibrazione:</p>
+    <ul>
+      <li><b>Trend</b>: volatilita' storica 4h bassa + ADX &gt; 25</li>
+      <li><b>Ranging</b>: ATR normalizzato sotto media + BB squeeze</li>
+      <li><b>Volatile</b>: ATR &gt; 2x media</li>
+    </ul>
+  </div>
+</section>
+"""
+
+_R5_ARCHITECTURE = """
+<section class="section">
+  <div class="section-title">Architecture</div>
+  <div class="code-block">
++-------------------+     +-------------------+     +-------------------+
+|    TradingView    |     |      n8n           |     |   Kraken Futures  |
+|   (LWC v4 chart)  | &lt;-- |  (6 workflows)     | --&gt; |   (PF_XBTUSD)     |
++-------------------+     +-------------------+     +-------------------+
+                                  |
+                          +-------+-------+
+                          |               |
+                    +-----v-----+   +-----v-----+
+                    |  Supabase  |   | Polygon   |
+                    | (PostgreSQL)|   | PoS Chain |
+                    +-----+-----+   +-----------+
+                          |
+                    +-----v-----+
+                    |  Railway   |
+                    | Flask API  |
+                    | + Cockpit  |
+                    +-----------+
+  </div>
+</section>
+"""
 
+# Fixed targets — the grid never changes between runs, so render it once.
+_R5_Q2_KPIS = _kpi_grid((
+    ("55%+", "Target WR", "accent"),
+    ("$150+", "Target Equity", "accent"),
+    ("Active", "XGB Gate", "accent"),
+    ("3+", "New Features", "accent"),
+))
 
-def _pnl_class(pnl):
-    return "val-up" if pnl > 0 else ("val-down" if pnl < 0 else "val-muted")
+_R5_ROADMAP_P1_P3 = """
+  <div class="card-panel">
+    <h3>P1 — Alto</h3>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p1">P1</div>
+      <div class="roadmap-content">
+        <h4>Regime Detection Feature</h4>
+        <p>Aggiungere label trend/ranging/volatile come feature XGBoost. Volatilita' storica 4h + ADX + BB squeeze.</p>
+      </div>
+    </div>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p1">P1</div>
+      <div class="roadmap-content">
+        <h4>On-chain Metrics Integration</h4>
+        <p>SOPR, MVRV Z-score, exchange netflow come features aggiuntive.</p>
+      </div>
+    </div>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p1">P1</div>
+      <div class="roadmap-content">
+        <h4>Funding Rate Filter</h4>
+        <p>Integrare funding rate come guard: se funding &gt; 0.08% e direzione = LONG, penalizzare o bloccare.</p>
+      </div>
+    </div>
+  </div>
+
+  <div class="card-panel">
+    <h3>P2 — Medio</h3>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p2">P2</div>
+      <div class="roadmap-content">
+        <h4>Multi-Timeframe Analysis</h4>
+        <p>Combinare segnali 5m, 15m, 1h per conferma multi-TF prima dell'esecuzione.</p>
+      </div>
+    </div>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p2">P2</div>
+      <div class="roadmap-content">
+        <h4>Advanced Position Sizing</h4>
+        <p>Kelly criterion dinamico basato su rolling WR + volatilita' corrente. Attualmente: fisso ~2% del capitale.</p>
+      </div>
+    </div>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p2">P2</div>
+      <div class="roadmap-content">
+        <h4>Dashboard v2</h4>
+        <p>Cockpit con grafici interattivi, equity curve live, e filter per timeframe.</p>
+      </div>
+    </div>
+  </div>
+
+  <div class="card-panel">
+    <h3>P3 — Backlog</h3>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p3">P3</div>
+      <div class="roadmap-content">
+        <h4>ERC-4337 Account Abstraction</h4>
+        <p>Gas sponsorship per wallet utenti senza MATIC. Migliora UX per verificatori esterni.</p>
+      </div>
+    </div>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p3">P3</div>
+      <div class="roadmap-content">
+        <h4>Weekly Merkle Root on Ethereum</h4>
+        <p>Un singolo hash settimanale su Ethereum L1 per auditability istituzionale.</p>
+      </div>
+    </div>
+    <div class="roadmap-item">
+      <div class="roadmap-priority p3">P3</div>
+      <div class="roadmap-content">
+        <h4>Multi-Asset Expansion</h4>
+        <p>Estendere a ETH, SOL con lo stesso framework di signal + on-chain commit.</p>
+      </div>
+    </div>
+  </div>
+</section>
+"""
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -419,27 +732,30 @@ def render_report_1(data, analytics):
     mode_chip = ("REAL", "") if not dry_run else ("DRY RUN", "warn")
 
     # Alerts
-    alerts = ""
+    alert_parts = []
     if a["wr"] < 45:
-        alerts += _alert(f"<b>Win Rate critico: {a['wr']:.1f}%</b> — sotto il coin flip. Valutare pausa e retrain.", "red")
+        alert_parts.append(_alert(f"<b>Win Rate critico: {a['wr']:.1f}%</b> — sotto il coin flip. Valutare pausa e retrain.", "red"))
     if a["down_pct_50"] > 65:
-        alerts += _alert(f"<b>DOWN bias: {a['down_pct_50']:.0f}%</b> degli ultimi 50 segnali sono DOWN. Verificare prompt anti-bias.", "yellow")
+        alert_parts.append(_alert(f"<b>DOWN bias: {a['down_pct_50']:.0f}%</b> degli ultimi 50 segnali sono DOWN. Verificare prompt anti-bias.", "yellow"))
     if not xgb_active:
-        alerts += _alert(f"<b>XGB Gate disattivo</b> — {xgb_bets}/{xgb_min} clean bets. Tutti i segnali diventano bet (0 ghost).", "yellow")
+        alert_parts.append(_alert(f"<b>XGB Gate disattivo</b> — {xgb_bets}/{xgb_min} clean bets. Tutti i segnali diventano bet (0 ghost).", "yellow"))
     if paused:
-        alerts += _alert("<b>Bot in PAUSA</b> — nessun trade attivo.", "red")
-    if not alerts:
-        alerts = _alert("Nessuna anomalia rilevata. Sistema operativo.", "green")
+        alert_parts.append(_alert("<b>Bot in PAUSA</b> — nessun trade attivo.", "red"))
+    if not alert_parts:
+        alert_parts.append(_alert("Nessuna anomalia rilevata. Sistema operativo.", "green"))
+    alerts = "".join(alert_parts)
 
     # Score bar
-    scores = ""
-    scores += _score_bar("Win Rate Globale", a["wr"], 100, _wr_color(a["wr"]))
-    scores += _score_bar("Win Rate UP", a["up_wr"], 100, _wr_color(a["up_wr"]))
-    scores += _score_bar("Win Rate DOWN", a["down_wr"], 100, _wr_color(a["down_wr"]))
-    scores += _score_bar("Win Rate Last 10", a["wr_10"], 100, _wr_color(a["wr_10"]))
-    scores += _score_bar("Win Rate Last 50", a["wr_50"], 100, _wr_color(a["wr_50"]))
+    score_parts = [
+        _score_bar("Win Rate Globale", a["wr"], 100, _wr_color(a["wr"])),
+        _score_bar("Win Rate UP", a["up_wr"], 100, _wr_color(a["up_wr"])),
+        _score_bar("Win Rate DOWN", a["down_wr"], 100, _wr_color(a["down_wr"])),
+        _score_bar("Win Rate Last 10", a["wr_10"], 100, _wr_color(a["wr_10"])),
+        _score_bar("Win Rate Last 50", a["wr_50"], 100, _wr_color(a["wr_50"])),
+    ]
     if a["ghost_evaluated"] > 0:
-        scores += _score_bar(f"Ghost WR ({a['ghost_evaluated']} evaluated)", a["ghost_wr"], 100, _wr_color(a["ghost_wr"]))
+        score_parts.append(_score_bar(f"Ghost WR ({a['ghost_evaluated']} evaluated)", a["ghost_wr"], 100, _wr_color(a["ghost_wr"])))
+    scores = "".join(score_parts)
 
     body = f"""
 <section class="section">
@@ -543,7 +859,7 @@ def render_report_1(data, analytics):
         "BTC Predictor Bot — Comprehensive System Health Check",
         meta_chips,
         body,
-        data["generated_at"],
+        _report_date(data),
     )
 
 
@@ -553,33 +869,32 @@ def render_report_1(data, analytics):
 def render_report_2(data, analytics):
     a = analytics
     h = data["health"]
-    eq_history = data["equity_history"]
+    sorted_eq = a["equity_sorted"]
 
     # Equity curve as CSS bars
-    equity_bars = ""
-    if eq_history:
-        sorted_eq = sorted(eq_history, key=lambda x: x.get("created_at", ""))
+    bars = []
+    if sorted_eq:
         capital = h.get("capital", 100)
         for pt in sorted_eq[-80:]:  # last 80 points
             e = pt.get("equity", capital)
             pnl = pt.get("pnl_usd", 0) or 0
-            cls = "up" if pnl > 0 else ("down" if pnl < 0 else "flat")
-            h_pct = max(e / (capital * 1.2) * 100, 5) if capital > 0 else 50
-            equity_bars += f'<div class="equity-bar {cls}" style="height:{h_pct:.0f}%" title="${e:.2f}"></div>\n'
+            bars.append({
+                "cls": "up" if pnl > 0 else ("down" if pnl < 0 else "flat"),
+                "h_pct": max(e / (capital * 1.2) * 100, 5) if capital > 0 else 50,
+                "e": e,
+            })
+    equity_bars = "".join(map(_EQUITY_BAR_TMPL.format_map, bars))
 
     # Confidence calibration table
-    conf_rows = ""
-    for bucket in ["<55%", "55-60%", "60-65%", "65-70%", "70%+"]:
-        stats = a["conf_buckets"].get(bucket, {"total": 0, "wins": 0})
-        t = stats["total"]
-        w = stats["wins"]
-        wr = (w / t * 100) if t > 0 else 0
-        conf_rows += f"""<tr>
+    conf_parts = []
+    for bucket, t, w, wr in a["conf_table"]:
+        conf_parts.append(f"""<tr>
   <td>{bucket}</td>
   <td class="center">{t}</td>
   <td class="center">{w}</td>
-  <td class="center"><span class="{_wr_color(wr)}">{wr:.1f}%</span></td>
-</tr>"""
+  <td class="center"><span class="{_WR_CLS[(wr >= 45) + (wr >= 55)]}">{wr:.1f}%</span></td>
+</tr>""")
+    conf_rows = "".join(conf_parts)
 
     # PnL by direction
     body = f"""
@@ -652,7 +967,7 @@ def render_report_2(data, analytics):
         "BTC Predictor Bot — Equity, Win Rate & PnL Analysis",
         [("LIVE DATA", "")],
         body,
-        data["generated_at"],
+        _report_date(data),
     )
 
 
@@ -664,44 +979,37 @@ def render_report_3(data, analytics):
     closed = a["closed_bets_sorted"]
 
     # Main bet table (last 100)
-    bet_rows = ""
+    rows = []
     for b in closed[:100]:
-        ts = b.get("created_at", "")[:16].replace("T", " ")
         direction = b.get("direction", "?")
-        conf = b.get("confidence") or b.get("model_confidence") or 0
-        pnl = b.get("pnl_usd", 0) or 0
-        entry = b.get("entry_price") or b.get("signal_price", 0)
-        exit_p = b.get("exit_price", 0) or 0
-        status = b.get("status", "")
-
-        dir_cls = "val-up" if direction == "UP" else "val-down"
-        pnl_cls = _pnl_class(pnl)
-
-        bet_rows += f"""<tr>
-  <td class="mono">{ts}</td>
-  <td class="center"><span class="{dir_cls}">{direction}</span></td>
-  <td class="center">{conf:.1%}</td>
-  <td class="right mono">${entry:,.2f}</td>
-  <td class="right mono">${exit_p:,.2f}</td>
-  <td class="right"><span class="{pnl_cls}">${pnl:+.4f}</span></td>
-  <td class="center">{status}</td>
-</tr>"""
+        pnl = b["pnl_usd"]
+        rows.append({
+            "ts": b.get("created_at", "")[:16].replace("T", " "),
+            "direction": direction,
+            "dir_cls": "val-up" if direction == "UP" else "val-down",
+            "conf": b.get("confidence") or b.get("model_confidence") or 0,
+            "entry": b.get("entry_price") or b.get("signal_price", 0),
+            "exit_p": b.get("exit_price", 0) or 0,
+            "pnl": pnl,
+            "pnl_cls": _PNL_CLS[(pnl > 0) - (pnl < 0)],
+            "status": b.get("status", ""),
+        })
+    bet_rows = "".join(map(_BET_ROW_TMPL.format_map, rows))
 
     # Hourly PnL table
-    hourly_rows = ""
+    rows = []
     for h in range(24):
         hs = a["hourly_stats"].get(h, {"total": 0, "wins": 0, "pnl": 0})
         t = hs["total"]
         w = hs["wins"]
         wr = (w / t * 100) if t > 0 else 0
         pnl = hs["pnl"]
-        hourly_rows += f"""<tr>
-  <td class="center">{h:02d}:00</td>
-  <td class="center">{t}</td>
-  <td class="center">{w}</td>
-  <td class="center"><span class="{_wr_color(wr)}">{wr:.0f}%</span></td>
-  <td class="right"><span class="{_pnl_class(pnl)}">${pnl:+.4f}</span></td>
-</tr>"""
+        rows.append({
+            "h": h, "t": t, "w": w, "wr": wr, "pnl": pnl,
+            "wr_cls": _WR_CLS[(wr >= 45) + (wr >= 55)],
+            "pnl_cls": _PNL_CLS[(pnl > 0) - (pnl < 0)],
+        })
+    hourly_rows = "".join(map(_HOURLY_ROW_TMPL.format_map, rows))
 
     body = f"""
 <section class="section">
@@ -777,7 +1085,7 @@ def render_report_3(data, analytics):
         "BTC Predictor Bot — Storico completo, filtri per ora e direzione",
         [("LIVE DATA", ""), (f"{a['total']} trades", "info")],
         body,
-        data["generated_at"],
+        _report_date(data),
     )
 
 
@@ -793,33 +1101,7 @@ def render_report_4(data, analytics):
     xgb_min = h.get("xgb_min_bets", 100)
     conf_threshold = h.get("confidence_threshold", 0.56)
 
-    body = f"""
-<section class="section">
-  <div class="section-title">Architecture Overview</div>
-  <div class="section-desc">Il flusso completo dal segnale all'esecuzione su Kraken Futures</div>
-  <div class="code-block">
-Signal Generation (n8n wf01A)
-  |
-  v
-place_bet() &rarr; Auth &rarr; Rate Limit &rarr; Parse &rarr; Direction
-  |
-  v
-Dead Hours Guard &rarr; XGB Gate &rarr; DOWN Kill Switch
-  |
-  v
-Pre-flight Checks &rarr; Slippage Guard &rarr; DRY_RUN Check
-  |
-  v
-Position Sizing (Kelly-derived) &rarr; create_order() &rarr; Kraken Futures
-  |
-  v
-On-chain Commit (Polygon PoS) &rarr; Supabase Log &rarr; Telegram Alert
-  |
-  v
-Ghost Verification (T+30m, wf08) &rarr; Auto-Retrain (03:00 UTC, wf10)
-  </div>
-</section>
-
+    parts = [_R4_ARCHITECTURE, f"""
 <section class="section">
   <div class="section-title">Guard System</div>
   <div class="section-desc">Ogni guard puo' bloccare o modificare il trade prima dell'esecuzione</div>
@@ -867,50 +1149,26 @@ Ghost Verification (T+30m, wf08) &rarr; Auto-Retrain (03:00 UTC, wf10)
 <section class="section">
   <div class="section-title">Confidence Calibration</div>
   <div class="section-desc">La confidence del modello dovrebbe correlare positivamente con il win rate reale</div>
-"""
-    for bucket in ["<55%", "55-60%", "60-65%", "65-70%", "70%+"]:
-        stats = a["conf_buckets"].get(bucket, {"total": 0, "wins": 0})
-        t = stats["total"]
-        wr = (stats["wins"] / t * 100) if t > 0 else 0
-        body += _score_bar(f"{bucket} ({t} trades)", wr, 100, _wr_color(wr))
+"""]
+    for bucket, t, _, wr in a["conf_table"]:
+        parts.append(_score_bar(f"{bucket} ({t} trades)", wr, 100, _WR_CLS[(wr >= 45) + (wr >= 55)]))
 
-    body += """
-</section>
-
-<section class="section">
-  <div class="section-title">Ghost Signal Verification</div>
-  <div class="section-desc">Segnali filtrati dal gate vengono comunque valutati a T+30min per misurare l'accuratezza latente</div>
-  <div class="card-panel">
-    <ul>
-      <li>Logica: exit price vs signal price a T+30min (Binance 1m kline)</li>
-      <li>Colonne Supabase: ghost_correct, ghost_entry_price, ghost_exit_price, ghost_pnl_usd</li>
-"""
-    body += f"""      <li>Ghost totali: <b>{a['ghosts_total']}</b></li>
+    parts.append(_R4_GHOST_HEAD)
+    parts.append(f"""      <li>Ghost totali: <b>{a['ghosts_total']}</b></li>
       <li>Evaluated: <b>{a['ghost_evaluated']}</b></li>
       <li>Ghost WR: <b>{a['ghost_wr']:.1f}%</b></li>
     </ul>
   </div>
 </section>
-
-<section class="section">
-  <div class="section-title">Regime Detection</div>
-  <div class="card-panel">
-    <h3>Status: Planned (P1)</h3>
-    <p>I mercati alternano tra trend, ranging e volatile. Aggiungere una label di regime come feature XGBoost migliorerebbe la calibrazione:</p>
-    <ul>
-      <li><b>Trend</b>: volatilita' storica 4h bassa + ADX &gt; 25</li>
-      <li><b>Ranging</b>: ATR normalizzato sotto media + BB squeeze</li>
-      <li><b>Volatile</b>: ATR &gt; 2x media</li>
-    </ul>
-  </div>
-</section>
-"""
+""")
+    parts.append(_R4_REGIME)
+    body = "".join(parts)
     return _html_wrap(
         "Trading Strategy & ML",
         "BTC Predictor Bot — Architettura, Guard System, XGBoost Pipeline",
         [("LIVE DATA", ""), (f"v{h.get('version', '?')}", "info")],
         body,
-        data["generated_at"],
+        _report_date(data),
     )
 
 
@@ -924,14 +1182,14 @@ def render_report_5(data, analytics):
     xgb_bets = h.get("xgb_clean_bets", 0)
     xgb_min = h.get("xgb_min_bets", 100)
 
-    body = f"""
+    parts = [f"""
 <section class="section">
   <div class="section-title">Project Overview</div>
   <div class="kpi-grid">
-    {_kpi(f"v{version}", "Current Version")}
-    {_kpi("1 Mar 2026", "Go-Live Date")}
-    {_kpi(str(a['total']), "Total Trades")}
-    {_kpi("Polygon PoS", "Blockchain", "accent")}
+    {_kpi_grid(((f"v{version}", "Current Version", ""),
+                ("1 Mar 2026", "Go-Live Date", ""),
+                (a['total'], "Total Trades", ""),
+                ("Polygon PoS", "Blockchain", "accent")))}
   </div>
   <div class="card-panel" style="margin-top:24px">
     <h3>Mission</h3>
@@ -940,30 +1198,7 @@ def render_report_5(data, analytics):
     rendendo impossibile la retrodatazione dei risultati. Trasparenza radicale come vantaggio competitivo.</p>
   </div>
 </section>
-
-<section class="section">
-  <div class="section-title">Architecture</div>
-  <div class="code-block">
-+-------------------+     +-------------------+     +-------------------+
-|    TradingView    |     |      n8n           |     |   Kraken Futures  |
-|   (LWC v4 chart)  | &lt;-- |  (6 workflows)     | --&gt; |   (PF_XBTUSD)     |
-+-------------------+     +-------------------+     +-------------------+
-                                  |
-                          +-------+-------+
-                          |               |
-                    +-----v-----+   +-----v-----+
-                    |  Supabase  |   | Polygon   |
-                    | (PostgreSQL)|   | PoS Chain |
-                    +-----+-----+   +-----------+
-                          |
-                    +-----v-----+
-                    |  Railway   |
-                    | Flask API  |
-                    | + Cockpit  |
-                    +-----------+
-  </div>
-</section>
-
+""", _R5_ARCHITECTURE, f"""
 <section class="section page-break">
   <div class="section-title">Roadmap</div>
   <div class="section-desc">Priorita': P0 = critico, P1 = alto, P2 = medio, P3 = backlog</div>
@@ -985,101 +1220,23 @@ def render_report_5(data, analytics):
       </div>
     </div>
   </div>
-
-  <div class="card-panel">
-    <h3>P1 — Alto</h3>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p1">P1</div>
-      <div class="roadmap-content">
-        <h4>Regime Detection Feature</h4>
-        <p>Aggiungere label trend/ranging/volatile come feature XGBoost. Volatilita' storica 4h + ADX + BB squeeze.</p>
-      </div>
-    </div>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p1">P1</div>
-      <div class="roadmap-content">
-        <h4>On-chain Metrics Integration</h4>
-        <p>SOPR, MVRV Z-score, exchange netflow come features aggiuntive.</p>
-      </div>
-    </div>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p1">P1</div>
-      <div class="roadmap-content">
-        <h4>Funding Rate Filter</h4>
-        <p>Integrare funding rate come guard: se funding &gt; 0.08% e direzione = LONG, penalizzare o bloccare.</p>
-      </div>
-    </div>
-  </div>
-
-  <div class="card-panel">
-    <h3>P2 — Medio</h3>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p2">P2</div>
-      <div class="roadmap-content">
-        <h4>Multi-Timeframe Analysis</h4>
-        <p>Combinare segnali 5m, 15m, 1h per conferma multi-TF prima dell'esecuzione.</p>
-      </div>
-    </div>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p2">P2</div>
-      <div class="roadmap-content">
-        <h4>Advanced Position Sizing</h4>
-        <p>Kelly criterion dinamico basato su rolling WR + volatilita' corrente. Attualmente: fisso ~2% del capitale.</p>
-      </div>
-    </div>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p2">P2</div>
-      <div class="roadmap-content">
-        <h4>Dashboard v2</h4>
-        <p>Cockpit con grafici interattivi, equity curve live, e filter per timeframe.</p>
-      </div>
-    </div>
-  </div>
-
-  <div class="card-panel">
-    <h3>P3 — Backlog</h3>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p3">P3</div>
-      <div class="roadmap-content">
-        <h4>ERC-4337 Account Abstraction</h4>
-        <p>Gas sponsorship per wallet utenti senza MATIC. Migliora UX per verificatori esterni.</p>
-      </div>
-    </div>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p3">P3</div>
-      <div class="roadmap-content">
-        <h4>Weekly Merkle Root on Ethereum</h4>
-        <p>Un singolo hash settimanale su Ethereum L1 per auditability istituzionale.</p>
-      </div>
-    </div>
-    <div class="roadmap-item">
-      <div class="roadmap-priority p3">P3</div>
-      <div class="roadmap-content">
-        <h4>Multi-Asset Expansion</h4>
-        <p>Estendere a ETH, SOL con lo stesso framework di signal + on-chain commit.</p>
-      </div>
-    </div>
-  </div>
-</section>
-
+""", _R5_ROADMAP_P1_P3, f"""
 <section class="section">
   <div class="section-title">Q2 2026 Objectives</div>
   <div class="kpi-grid">
-    {_kpi("55%+", "Target WR", "accent")}
-    {_kpi("$150+", "Target Equity", "accent")}
-    {_kpi("Active", "XGB Gate", "accent")}
-    {_kpi("3+", "New Features", "accent")}
+    {_R5_Q2_KPIS}
   </div>
   {"" if a['wr'] >= 50 else _alert(f"<b>WR attuale {a['wr']:.1f}%</b> — focus primario su miglioramento accuratezza prima di scalare il capitale.", "yellow")}
 </section>
-"""
+"""]
+    body = "".join(parts)
 
     return _html_wrap(
         "System Vision & Roadmap",
         "BTC Predictor Bot — Architettura Cloud, Obiettivi Q2 2026",
         [(f"v{version}", "info")],
         body,
-        data["generated_at"],
+        _report_date(data),
     )
 
 
@@ -1095,53 +1252,267 @@ REPORTS = [
 ]
 
 
-def generate_html(data, analytics):
-    """Generate all 5 HTML reports."""
+def _digest(data_bytes):
+    return hashlib.blake2b(data_bytes, digest_size=16).hexdigest()
+
+
+def _write_report(out, html, compress=False):
+    """Write one rendered report + its content digest sidecar, return size in KB.
+
+    compress=True also writes a pre-gzipped <report>.html.gz for gzip-aware
+    static serving (mtime=0 so identical HTML gives identical bytes). Chrome
+    keeps reading the plain .html.
+    """
+    data_bytes = html.encode("utf-8")  # encoded once, shared by the file, the digest and the .gz
+    out.write_bytes(data_bytes)
+    out.with_suffix(".html.sha").write_text(_digest(data_bytes))
+    if compress:
+        out.with_suffix(".html.gz").write_bytes(gzip.compress(data_bytes, compresslevel=6, mtime=0))
+    return len(data_bytes) / 1024
+
+
+# Renderer registry for worker processes: tasks carry only the report name,
+# (data, analytics) are shipped once per worker through the pool initializer.
+_RENDERERS = {filename: renderer for filename, _, renderer in REPORTS}
+_WORKER_CTX = None
+
+
+def _init_render_worker(data, analytics):
+    global _WORKER_CTX
+    _WORKER_CTX = (data, analytics)
+
+
+def _render_one(filename):
+    return _RENDERERS[filename](*_WORKER_CTX)
+
+
+def _render_all(data, analytics, jobs):
+    """Render every report, in a process pool when jobs > 1. Returns HTML in REPORTS order."""
+    if jobs <= 1:
+        return [renderer(data, analytics) for _, _, renderer in REPORTS]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker,
+                             initargs=(data, analytics)) as pool:
+        return list(pool.map(_render_one, [filename for filename, _, _ in REPORTS]))
+
+
+def generate_html(data, analytics, jobs=1, compress=False):
+    """Generate all 5 HTML reports (rendered on `jobs` processes, written concurrently).
+
+    Returns (path, file:// URI) pairs; the directory is resolved once here so the
+    PDF step never has to stat/realpath each file again.
+    """
     REPORTS_DIR.mkdir(exist_ok=True)
-    paths = []
-    for filename, label, renderer in REPORTS:
-        html = renderer(data, analytics)
-        out = REPORTS_DIR / f"{filename}.html"
-        out.write_text(html, encoding="utf-8")
-        size_kb = out.stat().st_size / 1024
+    reports_dir = REPORTS_DIR.resolve()
+    _report_date(data)  # format the shared timestamp once, before data is shipped to workers
+    htmls = _render_all(data, analytics, jobs)
+    rendered = [
+        (label, reports_dir / f"{filename}.html", html)
+        for (filename, label, _), html in zip(REPORTS, htmls)
+    ]
+    with ThreadPoolExecutor(max_workers=len(rendered)) as pool:
+        sizes = list(pool.map(lambda r: _write_report(r[1], r[2], compress), rendered))
+
+    reports = []
+    for (label, out, _), size_kb in zip(rendered, sizes):
         print(f"  [{label}] -> {out.name} ({size_kb:.0f} KB)")
-        paths.append(out)
-    return paths
+        reports.append((out, out.as_uri()))
+    return reports
+
+
+# Flags that trim Chrome startup work we don't need for a local print-to-pdf
+CHROME_PDF_FLAGS = [
+    "--headless",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--log-level=3",  # fatal only — keeps Chrome's stderr chatter out of the pipe
+    "--no-margins",
+    "--no-pdf-header-footer",
+    "--print-background",
+]
+
+
+def _render_pdf(chrome, html_path, html_uri):
+    """Convert one HTML file with Chrome Headless. Returns (pdf_path | None, log line)."""
+    pdf_path = ICLOUD_DIR / (html_path.stem + ".pdf")
+    cmd = [chrome, *CHROME_PDF_FLAGS, f"--print-to-pdf={pdf_path}", html_uri]
+    try:
+        # stdout is never read: discard it instead of buffering Chrome's logs
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=30, check=True)
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr[:200].decode("utf-8", errors="replace") if e.stderr else str(e)
+        return None, f"  [ERROR] PDF {pdf_path.name}: {stderr}"
+    except subprocess.TimeoutExpired:
+        return None, f"  [ERROR] PDF {pdf_path.name}: timeout after 30s"
+    except FileNotFoundError:
+        return None, f"  [ERROR] Chrome not found at: {chrome}"
+    size_kb = pdf_path.stat().st_size / 1024
+    return pdf_path, f"  [PDF] {pdf_path.name} ({size_kb:.0f} KB)"
+
+
+class _DevTools:
+    """Minimal Chrome DevTools Protocol client over the browser websocket (flat sessions)."""
+
+    def __init__(self, ws_url, timeout=30):
+        self.ws = _ws_connect(ws_url, max_size=None, open_timeout=timeout)
+        self.timeout = timeout
+        self._next_id = 0
+        self._events = []
+
+    def call(self, method, params=None, session_id=None):
+        self._next_id += 1
+        msg = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id:
+            msg["sessionId"] = session_id
+        self.ws.send(json.dumps(msg))
+        while True:
+            resp = json.loads(self.ws.recv(timeout=self.timeout))
+            if resp.get("id") != self._next_id:
+                self._events.append(resp)
+                continue
+            if "error" in resp:
+                raise RuntimeError(f"{method}: {resp['error'].get('message')}")
+            return resp.get("result", {})
+
+    def wait_event(self, method, session_id):
+        for i, ev in enumerate(self._events):
+            if ev.get("method") == method and ev.get("sessionId") == session_id:
+                return self._events.pop(i)
+        while True:
+            ev = json.loads(self.ws.recv(timeout=self.timeout))
+            if ev.get("method") == method and ev.get("sessionId") == session_id:
+                return ev
+            self._events.append(ev)
+
+    def close(self):
+        self.ws.close()
+
+
+def _print_via_devtools(chrome, reports, startup_timeout=15):
+    """Print every HTML file to PDF through ONE headless Chrome driven over DevTools.
+
+    Pays Chrome's cold start once instead of once per report. Returns the same
+    (pdf_path | None, log line) tuples as _render_pdf, in input order. Raises if
+    the browser or the DevTools session cannot be brought up.
+    """
+    profile = tempfile.mkdtemp(prefix="btc_reports_chrome_")
+    proc = subprocess.Popen(
+        [chrome, "--headless", "--disable-gpu", "--disable-dev-shm-usage",
+         "--disable-extensions", "--disable-background-networking", "--log-level=3",
+         "--remote-debugging-port=0", f"--user-data-dir={profile}", "about:blank"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    cdp = None
+    try:
+        # Chrome writes "<port>\n<browser ws path>" here once DevTools is listening
+        active_port = Path(profile) / "DevToolsActivePort"
+        deadline = time.time() + startup_timeout
+        while True:
+            lines = _read_sidecar(active_port)
+            lines = lines.splitlines() if lines else []
+            if len(lines) >= 2:
+                break
+            if proc.poll() is not None or time.time() > deadline:
+                raise RuntimeError("Chrome DevTools endpoint did not come up")
+            time.sleep(0.05)
+        cdp = _DevTools(f"ws://127.0.0.1:{lines[0]}{lines[1]}")
+
+        results = []
+        for html_path, html_uri in reports:
+            pdf_path = ICLOUD_DIR / (html_path.stem + ".pdf")
+            target_id = cdp.call("Target.createTarget", {"url": "about:blank"})["targetId"]
+            try:
+                session = cdp.call("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+                cdp.call("Page.enable", session_id=session)
+                cdp.call("Page.navigate", {"url": html_uri}, session_id=session)
+                cdp.wait_event("Page.loadEventFired", session)
+                pdf = cdp.call("Page.printToPDF", {
+                    "printBackground": True,
+                    "preferCSSPageSize": True,
+                    "marginTop": 0, "marginBottom": 0, "marginLeft": 0, "marginRight": 0,
+                }, session_id=session)
+                data_bytes = base64.b64decode(pdf["data"])
+                pdf_path.write_bytes(data_bytes)
+                results.append((pdf_path, f"  [PDF] {pdf_path.name} ({len(data_bytes) / 1024:.0f} KB)"))
+            except (RuntimeError, TimeoutError, KeyError) as e:
+                results.append((None, f"  [ERROR] PDF {pdf_path.name}: {e}"))
+            finally:
+                cdp.call("Target.closeTarget", {"targetId": target_id})
+        return results
+    finally:
+        if cdp is not None:
+            try:
+                cdp.call("Browser.close")
+            except Exception:
+                pass
+            cdp.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        shutil.rmtree(profile, ignore_errors=True)
+
 
+def _read_sidecar(path):
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
 
-def convert_to_pdf(html_paths):
-    """Convert HTML files to PDF via Chrome Headless."""
+
+def convert_to_pdf(reports, force=False, devtools=True):
+    """Convert the (path, URI) pairs from generate_html to PDF via Chrome Headless.
+
+    With devtools=True (and websockets installed) one browser prints every report
+    over the DevTools Protocol; otherwise, or if that session fails to start,
+    several Chrome processes run at a time. A report is skipped when its PDF
+    exists and was produced from byte-identical HTML (digest in <report>.pdf.sha
+    next to the HTML), unless force=True.
+    """
     chrome = CHROME if Path(CHROME).exists() else CHROME_FALLBACK
     if not Path(chrome).exists():
         print("[ERROR] Chrome not found. Skipping PDF generation.")
         return []
+    if not reports:
+        return []
 
-    ICLOUD_DIR.mkdir(parents=True, exist_ok=True)
     pdf_paths = []
+    todo = []
+    for html_path, html_uri in reports:
+        pdf_path = ICLOUD_DIR / (html_path.stem + ".pdf")
+        html_sha = _read_sidecar(html_path.with_suffix(".html.sha"))
+        if (not force and html_sha and pdf_path.exists()
+                and html_sha == _read_sidecar(html_path.with_suffix(".pdf.sha"))):
+            print(f"  [PDF] {pdf_path.name} unchanged, skipped")
+            pdf_paths.append(pdf_path)
+        else:
+            todo.append((html_path, html_uri, html_sha))
+    if not todo:
+        return pdf_paths
+    ICLOUD_DIR.mkdir(parents=True, exist_ok=True)
 
-    for html_path in html_paths:
-        pdf_name = html_path.stem + ".pdf"
-        pdf_path = ICLOUD_DIR / pdf_name
-        cmd = [
-            chrome,
-            "--headless",
-            f"--print-to-pdf={pdf_path}",
-            "--no-margins",
-            "--no-pdf-header-footer",
-            "--print-background",
-            f"file://{html_path.resolve()}",
-        ]
+    results = None
+    if devtools and _ws_connect is not None:
         try:
-            subprocess.run(cmd, capture_output=True, timeout=30, check=True)
-            size_kb = pdf_path.stat().st_size / 1024
-            print(f"  [PDF] {pdf_name} ({size_kb:.0f} KB)")
+            results = _print_via_devtools(chrome, [(html_path, html_uri) for html_path, html_uri, _ in todo])
+        except Exception as e:
+            print(f"  [WARN] DevTools session failed ({e}) — falling back to one Chrome per report")
+
+    if results is None:
+        # Each Chrome is an independent, mostly CPU-bound process: cap the
+        # fan-out at the core count so they don't thrash each other.
+        workers = min(len(todo), os.cpu_count() or 1, 5)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda t: _render_pdf(chrome, t[0], t[1]), todo))
+
+    for (html_path, _, html_sha), (pdf_path, line) in zip(todo, results):
+        print(line)
+        if pdf_path is not None:
             pdf_paths.append(pdf_path)
-        except subprocess.CalledProcessError as e:
-            stderr = e.stderr.decode("utf-8", errors="replace")[:200] if isinstance(e.stderr, bytes) else (e.stderr[:200] if e.stderr else str(e))
-            print(f"  [ERROR] PDF {pdf_name}: {stderr}")
-        except FileNotFoundError:
-            print(f"  [ERROR] Chrome not found at: {chrome}")
-            break
+            if html_sha:
+                html_path.with_suffix(".pdf.sha").write_text(html_sha)
 
     return pdf_paths
 
@@ -1151,27 +1522,40 @@ def main():
     parser = argparse.ArgumentParser(description="Generate BTC Predictor reports")
     parser.add_argument("--pdf", action="store_true", help="Also generate PDFs via Chrome Headless")
     parser.add_argument("--open", action="store_true", help="Open PDFs after generation")
+    parser.add_argument("--force-pdf", action="store_true", help="Re-render PDFs even when the HTML is unchanged")
+    parser.add_argument("--no-devtools", action="store_true",
+                        help="Spawn one Chrome per PDF instead of sharing one browser over DevTools")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Also write pre-compressed <report>.html.gz next to each HTML")
+    parser.add_argument("--jobs", type=int, default=min(len(REPORTS), os.cpu_count() or 1),
+                        help="Worker processes for HTML rendering (1 = render in-process)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the in-run fetch memo (always hit the APIs)")
+    parser.add_argument("--cache-ttl", type=int, default=0, metavar="SECONDS",
+                        help=f"Reuse raw API responses cached in {FETCH_CACHE_DIR} for this long (dev iteration only)")
     args = parser.parse_args()
 
+    global FETCH_CACHE_TTL
+    FETCH_CACHE_TTL = max(args.cache_ttl, 0)
+
     # Fetch data
-    data = fetch_all_data()
+    data = fetch_all_data(use_cache=not args.no_cache)
     analytics = compute_analytics(data)
 
     # Generate HTML
     print("\nGenerating HTML reports...")
-    html_paths = generate_html(data, analytics)
+    reports = generate_html(data, analytics, jobs=args.jobs, compress=args.gzip)
 
     # Generate PDF
     if args.pdf:
         print("\nConverting to PDF (Chrome Headless)...")
-        pdf_paths = convert_to_pdf(html_paths)
+        pdf_paths = convert_to_pdf(reports, force=args.force_pdf, devtools=not args.no_devtools)
 
         if args.open and pdf_paths:
             print("\nOpening PDFs...")
             for p in pdf_paths:
                 subprocess.run(["open", str(p)])
 
-    print(f"\nDone! {len(html_paths)} HTML reports in {REPORTS_DIR}/")
+    print(f"\nDone! {len(reports)} HTML reports in {REPORTS_DIR}/")
     if args.pdf:
         print(f"PDFs in {ICLOUD_DIR}/")
 
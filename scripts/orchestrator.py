@@ -22,15 +22,22 @@ Usage:
 
 import subprocess
 import threading
+import queue
 import json
 import time
 import os
 import sys
 import signal
+import shutil
+import selectors
 import argparse
 from pathlib import Path
+from collections import deque
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import urllib3
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -49,6 +56,23 @@ ICLOUD_DIR = (
 )
 
 HEARTBEAT_TIMEOUT_SEC = 300  # 5 min — alert if no output
+STALL_TERMINATE_SEC = 3 * HEARTBEAT_TIMEOUT_SEC  # clone thread SIGTERMs a child silent this long
+STDOUT_POLL_SEC = 1  # clone thread re-checks its heartbeat / closed stdout at least this often
+CLONE_JOIN_TIMEOUT_SEC = 5  # after Ctrl+C: wait this long for clone threads, then close their stdout
+OUTPUT_TAIL_LINES = 512  # raw stream-json lines kept per clone (ring buffer)
+STDERR_TAIL_LINES = 100  # last stderr lines kept for the error message
+
+# stream-json events launch_clone never reads. Tool results come back as
+# "user" turns carrying whole file contents, so they are skipped before
+# json.loads; lines with any other key order are still parsed (and ignored).
+_IGNORED_EVENT_PREFIXES = ('{"type":"user"', '{"type":"system"')
+
+# Clean env for the clones, built once: remove the CLAUDECODE marker (and any
+# other CLAUDE* var) so nested `claude -p` doesn't refuse to start.
+_BASE_CLEAN_ENV = {k: v for k, v in os.environ.items() if "CLAUDE" not in k.upper()}
+_BASE_CLEAN_ENV["HOME"] = os.environ.get("HOME", "")
+_BASE_CLEAN_ENV["PATH"] = os.environ.get("PATH", "")
+_BASE_CLEAN_ENV["SHELL"] = os.environ.get("SHELL", "/bin/zsh")
 
 # Supabase cockpit push (reads from env vars, falls back to .mcp.json)
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "").rstrip("/")
@@ -66,46 +90,113 @@ if not SUPABASE_URL or not SUPABASE_KEY:
         pass
 
 
-def _push_cockpit_state(state: "CloneState"):
-    """Push agent state to Supabase cockpit_events table for web dashboard."""
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        return
+# Cockpit pushes run on one background thread over a keep-alive connection
+# pool, so the clone stdout loops never wait on Supabase. Queued snapshots
+# are coalesced per clone_id (last write wins) before each POST round.
+_cockpit_queue = queue.Queue()
+_cockpit_thread = None
+_cockpit_lock = threading.Lock()
+_cockpit_http = None
+
+
+def _post_cockpit(payload: dict):
+    global _cockpit_http
+    if _cockpit_http is None:
+        _cockpit_http = urllib3.PoolManager(num_pools=1, maxsize=4)
     try:
-        import urllib.request
-        payload = json.dumps({
-            "clone_id": state.config.id,
-            "name": state.config.name,
-            "role": state.config.role,
-            "status": state.status,
-            "model": state.config.model,
-            "phase": state.config.phase,
-            "current_task": state.last_message[:200] if state.last_message else "",
-            "last_message": state.last_message[:500] if state.last_message else "",
-            "thought": "",
-            "cost_usd": state.cost_usd,
-            "max_budget": state.config.max_budget,
-            "elapsed_sec": (time.time() - state.start_time) if state.start_time else 0,
-            "tasks_json": "[]",
-            "next_action": "",
-            "next_action_time": "",
-            "result_summary": state.result_text[:500] if state.result_text else "",
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        }).encode("utf-8")
-        req = urllib.request.Request(
+        _cockpit_http.request(
+            "POST",
             f"{SUPABASE_URL}/rest/v1/cockpit_events",
-            data=payload,
-            method="POST",
+            body=json.dumps(payload).encode("utf-8"),
             headers={
                 "apikey": SUPABASE_KEY,
                 "Authorization": f"Bearer {SUPABASE_KEY}",
                 "Content-Type": "application/json",
-                "Prefer": "resolution=merge-duplicates",
+                # return=minimal: PostgREST answers 201 with no row body to serialize/ship back
+                "Prefer": "return=minimal, resolution=merge-duplicates",
+                "Connection": "keep-alive",
             },
+            timeout=5,
+            retries=False,
         )
-        urllib.request.urlopen(req, timeout=5)
     except Exception:
         pass  # Non-blocking: cockpit push failure never stops the orchestrator
 
+
+def _cockpit_worker():
+    stop = False
+    while not stop:
+        snap = _cockpit_queue.get()
+        if snap is None:
+            break
+        pending = {snap["clone_id"]: snap}
+        while True:
+            try:
+                snap = _cockpit_queue.get_nowait()
+            except queue.Empty:
+                break
+            if snap is None:
+                stop = True  # flush what we have, then exit
+                break
+            pending[snap["clone_id"]] = snap
+        now_iso = datetime.now(timezone.utc).isoformat()
+        for payload in pending.values():
+            payload["updated_at"] = now_iso
+            _post_cockpit(payload)
+
+
+def _push_cockpit_state(state: "CloneState", status: str = None):
+    """Queue an agent state snapshot for the Supabase cockpit_events table (web dashboard).
+
+    `status` overrides the reported status (e.g. "stalled") without touching the state.
+    """
+    global _cockpit_thread
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        return
+    # Edge-triggered: identical status/cost/message → nothing new for the cockpit
+    sig = (status or state.status, round(state.cost_usd, 4), state.last_message[:200])
+    if sig == state.last_push_sig:
+        return
+    state.last_push_sig = sig
+    # Snapshot now: the worker must not read CloneState while launch_clone mutates it
+    snapshot = {
+        "clone_id": state.config.id,
+        "name": state.config.name,
+        "role": state.config.role,
+        "status": status or state.status,
+        "model": state.config.model,
+        "phase": state.config.phase,
+        "current_task": state.last_message[:200] if state.last_message else "",
+        "last_message": state.last_message[:500] if state.last_message else "",
+        "thought": "",
+        "cost_usd": state.cost_usd,
+        "max_budget": state.config.max_budget,
+        "elapsed_sec": (time.time() - state.start_time) if state.start_time else 0,
+        "tasks_json": "[]",
+        "next_action": "",
+        "next_action_time": "",
+        "result_summary": state.result_text[:500] if state.result_text else "",
+        # "updated_at" is stamped by the worker, once per batch
+    }
+    with _cockpit_lock:
+        if _cockpit_thread is None:
+            _cockpit_thread = threading.Thread(target=_cockpit_worker, name="cockpit-push", daemon=True)
+            _cockpit_thread.start()
+    _cockpit_queue.put_nowait(snapshot)
+
+
+def _flush_cockpit(timeout: float = 10.0):
+    """Drain pending cockpit pushes (final states) before the process exits."""
+    global _cockpit_thread
+    with _cockpit_lock:
+        thread, _cockpit_thread = _cockpit_thread, None
+    if thread is not None:
+        _cockpit_queue.put_nowait(None)
+        thread.join(timeout=timeout)
+
+SONNET_PRICING = (3.0, 15.0)
+OPUS_PRICING = (15.0, 75.0)
+
 @dataclass
 class CloneConfig:
     id: str
@@ -117,6 +208,8 @@ class CloneConfig:
     max_turns: int
     phase: str  # "A" or "B"
     allowed_tools: str = "Read,Edit,Write,Glob,Grep,Bash"
+    # ($/M input, $/M output) — fallback cost estimate when the result event has no cost
+    pricing_per_mtok: tuple = SONNET_PRICING
 
 CLONES = [
     # --- Batch: Post Go-Live Audit & Hardening (2 Mar 2026) ---
@@ -129,9 +222,11 @@ CLONES = [
     CloneConfig("c5", "C5 R&D", "Research & Development",
                 "c5_rnd.txt", "claude-sonnet-4-6", 5.0, 15, "A"),
     CloneConfig("c6", "C6 Trading", "Trading & Probabilistic Master",
-                "c6_trading.txt", "claude-opus-4-6", 7.0, 20, "A"),
+                "c6_trading.txt", "claude-opus-4-6", 7.0, 20, "A",
+                pricing_per_mtok=OPUS_PRICING),
     CloneConfig("c1", "C1 Full Stack", "Full Stack Developer",
-                "c1_fullstack.txt", "claude-opus-4-6", 8.0, 20, "A"),
+                "c1_fullstack.txt", "claude-opus-4-6", 8.0, 20, "A",
+                pricing_per_mtok=OPUS_PRICING),
     CloneConfig("c2", "C2 Blockchain", "Crypto & Blockchain Expert",
                 "c2_blockchain.txt", "claude-sonnet-4-6", 5.0, 15, "A"),
 ]
@@ -151,10 +246,25 @@ class CloneState:
     cost_usd: float = 0.0
     start_time: float = 0.0
     end_time: float = 0.0
-    output_lines: list = field(default_factory=list)
+    output_lines: deque = field(default_factory=lambda: deque(maxlen=OUTPUT_TAIL_LINES))  # tail only
     result_text: str = ""
     error: str = ""
     ddl_ready: bool = False       # C2 specific: DDL file created
+    last_push_sig: tuple = field(default=None, repr=False)  # last cockpit payload signature
+
+class AlertLog(list):
+    """Alerts in render order, with O(1) de-duplication through add()."""
+
+    def __init__(self):
+        super().__init__()
+        self._seen = set()
+
+    def add(self, msg: str, key: str = None):
+        """Append msg unless `key` (default: msg itself) was already alerted."""
+        key = msg if key is None else key
+        if key not in self._seen:
+            self._seen.add(key)
+            self.append(msg)
 
 # ---------------------------------------------------------------------------
 # Terminal UI (works without rich — graceful fallback)
@@ -169,8 +279,31 @@ try:
 except ImportError:
     HAS_RICH = False
 
+# Dashboards redraw only when a visible field changed, plus this periodic
+# refresh so the elapsed clock keeps moving while clones are quiet.
+DASHBOARD_FORCE_REFRESH_SEC = 10
+
+
 def clear_screen():
-    os.system("clear" if os.name != "nt" else "cls")
+    # ANSI cursor-home + clear-to-end: no `clear` subprocess per frame
+    sys.stdout.write("\x1b[H\x1b[J")
+
+def heartbeat_bucket(state: "CloneState", now: float) -> str:
+    """'' (not running) | green | yellow | red — the HB column state."""
+    if state.status != "running":
+        return ""
+    since = now - state.last_output_time
+    if since > HEARTBEAT_TIMEOUT_SEC:
+        return "red"
+    return "yellow" if since > 120 else "green"
+
+def dashboard_key(states: dict, alerts: list) -> tuple:
+    """Everything the dashboards show except the clock — redraw when it changes."""
+    now = time.time()
+    return (len(alerts), tuple(
+        (s.status, round(s.cost_usd, 2), s.last_message[:40], heartbeat_bucket(s, now))
+        for s in states.values()
+    ))
 
 def format_elapsed(seconds: float) -> str:
     m, s = divmod(int(seconds), 60)
@@ -179,14 +312,23 @@ def format_elapsed(seconds: float) -> str:
 def status_icon(status: str) -> str:
     return {"pending": "⏳", "running": "🔄", "done": "✅", "error": "❌"}.get(status, "?")
 
+def dashboard_totals(states: dict) -> tuple:
+    """(total_cost, total_budget, running, done) in a single pass over the clones."""
+    total_cost = total_budget = 0.0
+    running = done = 0
+    for s in states.values():
+        total_cost += s.cost_usd
+        total_budget += s.config.max_budget
+        running += s.status == "running"
+        done += s.status == "done"
+    return total_cost, total_budget, running, done
+
 def render_dashboard_plain(states: dict, start_time: float, alerts: list):
     """Fallback dashboard without rich library."""
     clear_screen()
-    elapsed = time.time() - start_time
-    total_cost = sum(s.cost_usd for s in states.values())
-    total_budget = sum(s.config.max_budget for s in states.values())
-    running = sum(1 for s in states.values() if s.status == "running")
-    done = sum(1 for s in states.values() if s.status == "done")
+    now = time.time()
+    elapsed = now - start_time
+    total_cost, total_budget, running, done = dashboard_totals(states)
 
     print("=" * 64)
     print(f"  BTC PREDICTOR — ORCHESTRATOR DASHBOARD")
@@ -198,11 +340,7 @@ def render_dashboard_plain(states: dict, start_time: float, alerts: list):
         phase = f"[Phase {state.config.phase}]"
         cost = f"${state.cost_usd:.2f}/{state.config.max_budget:.2f}"
         msg = state.last_message[:40] if state.last_message else ""
-        hb = ""
-        if state.status == "running":
-            since_output = time.time() - state.last_output_time
-            if since_output > HEARTBEAT_TIMEOUT_SEC:
-                hb = " ⚠️ NO OUTPUT"
+        hb = " ⚠️ NO OUTPUT" if heartbeat_bucket(state, now) == "red" else ""
         print(f"  {icon} {state.config.name:<16} {phase} {cost:>12}  {msg} {hb}")
 
     if alerts:
@@ -212,13 +350,13 @@ def render_dashboard_plain(states: dict, start_time: float, alerts: list):
     print("-" * 64)
     print("  Ctrl+C to stop all clones")
 
+_HB_ICONS = {"red": "⚠️", "yellow": "🟡", "green": "🟢"}
+
 def render_dashboard_rich(console: "Console", states: dict, start_time: float, alerts: list):
     """Rich-based dashboard."""
-    elapsed = time.time() - start_time
-    total_cost = sum(s.cost_usd for s in states.values())
-    total_budget = sum(s.config.max_budget for s in states.values())
-    running = sum(1 for s in states.values() if s.status == "running")
-    done = sum(1 for s in states.values() if s.status == "done")
+    now = time.time()
+    elapsed = now - start_time
+    total_cost, total_budget, running, done = dashboard_totals(states)
 
     table = Table(title=f"BTC PREDICTOR — ORCHESTRATOR  |  {done}/6 done  |  {running} running  |  ${total_cost:.2f}/${total_budget:.2f}  |  {format_elapsed(elapsed)}")
     table.add_column("Clone", style="bold cyan", width=16)
@@ -233,17 +371,8 @@ def render_dashboard_rich(console: "Console", states: dict, start_time: float, a
         phase = state.config.phase
         cost = f"${state.cost_usd:.2f}/{state.config.max_budget:.2f}"
         msg = (state.last_message[:38] + "..") if len(state.last_message) > 40 else state.last_message
-        hb = ""
-        if state.status == "running":
-            since = time.time() - state.last_output_time
-            if since > HEARTBEAT_TIMEOUT_SEC:
-                hb = "⚠️"
-            elif since > 120:
-                hb = "🟡"
-            else:
-                hb = "🟢"
-        elif state.status == "done":
-            hb = "✅"
+        hb = _HB_ICONS[heartbeat_bucket(state, now)] if state.status == "running" else (
+            "✅" if state.status == "done" else "")
 
         table.add_row(f"{icon} {state.config.name}", phase, state.status, cost, msg, hb)
 
@@ -255,12 +384,113 @@ def render_dashboard_rich(console: "Console", states: dict, start_time: float, a
         border_style="bright_blue",
     )
 
+# ---------------------------------------------------------------------------
+# UI events — clone threads notify, the monitor thread renders
+# ---------------------------------------------------------------------------
+
+# Clone threads post a (kind, clone_id) notice after each visible state change.
+# The monitor thread wakes on it, coalesces whatever arrives within
+# UI_COALESCE_SEC and renders once. Bounded + put_nowait: a chatty clone drops
+# notices instead of ever blocking on the renderer.
+UI_EVENTS_MAX = 256
+UI_COALESCE_SEC = 0.25
+ui_events = queue.Queue(maxsize=UI_EVENTS_MAX)
+
+
+def _notify_ui(kind: str, cid: str):
+    try:
+        ui_events.put_nowait((kind, cid))
+    except queue.Full:
+        pass
+
+
+def wait_ui_events(timeout: float) -> int:
+    """Block up to `timeout` for a state change, then drain the coalescing window.
+
+    Returns the number of notices consumed (0 = timed out, render for the clock only).
+    """
+    try:
+        ui_events.get(timeout=timeout)
+    except queue.Empty:
+        return 0
+    n = 1
+    deadline = time.time() + UI_COALESCE_SEC
+    while (left := deadline - time.time()) > 0:
+        try:
+            ui_events.get(timeout=left)
+            n += 1
+        except queue.Empty:
+            break
+    return n
+
 # ---------------------------------------------------------------------------
 # Clone Launcher
 # ---------------------------------------------------------------------------
 
 def launch_clone(state: CloneState, dry_run: bool = False):
     """Launch a single claude -p process and stream its output."""
+    try:
+        _run_clone(state, dry_run)
+    finally:
+        _notify_ui("exit", state.config.id)  # wake the monitor: completion shows immediately
+
+
+def _handle_stream_line(state: CloneState, line: str):
+    """Apply one stream-json line from a clone's stdout to its state."""
+    if not line:
+        return
+
+    state.last_output_time = time.time()
+    state.output_lines.append(line)
+    if line.startswith(_IGNORED_EVENT_PREFIXES):
+        return
+
+    # Parse stream-json events
+    try:
+        event = json.loads(line)
+        etype = event.get("type", "")
+
+        if etype == "assistant" and "message" in event:
+            # Extract text content
+            msg = event.get("message", {})
+            content = msg.get("content", [])
+            for block in content:
+                if block.get("type") == "text":
+                    text = block.get("text", "")
+                    if text:
+                        state.last_message = text[:80]
+                        # Detect C2 DDL ready
+                        if "DDL PRONTO" in text:
+                            state.ddl_ready = True
+                        # Push to cockpit every significant update
+                        _push_cockpit_state(state)
+                        _notify_ui("msg", state.config.id)
+
+        elif etype == "result":
+            # Final result — contains session_id, cost, etc.
+            state.session_id = event.get("session_id", "")
+            state.cost_usd = event.get("cost_usd", event.get("total_cost_usd", 0.0))
+            state.result_text = event.get("result", "")
+            # Try to extract cost from nested structure
+            if state.cost_usd == 0 and "usage" in event:
+                usage = event["usage"]
+                # Rough estimate from the clone's per-model list price
+                inp = usage.get("input_tokens", 0)
+                out = usage.get("output_tokens", 0)
+                inp_rate, out_rate = state.config.pricing_per_mtok
+                state.cost_usd = (inp * inp_rate + out * out_rate) / 1_000_000
+            _notify_ui("cost", state.config.id)
+
+        elif etype == "error":
+            state.error = event.get("error", {}).get("message", str(event))
+
+    except json.JSONDecodeError:
+        # Not JSON — raw text output
+        state.last_message = line[:80]
+        _notify_ui("msg", state.config.id)
+
+
+def _run_clone(state: CloneState, dry_run: bool):
     prompt_path = PROMPTS_DIR / state.config.prompt_file
     if not prompt_path.exists():
         state.status = "error"
@@ -289,88 +519,71 @@ def launch_clone(state: CloneState, dry_run: bool = False):
     state.start_time = time.time()
     state.last_output_time = time.time()
     _push_cockpit_state(state)  # initial push
+    _notify_ui("status", state.config.id)
 
     try:
-        # Clean env: remove CLAUDECODE marker so nested `claude -p` doesn't refuse to start
-        clean_env = {k: v for k, v in os.environ.items() if "CLAUDE" not in k.upper()}
-        clean_env["HOME"] = os.environ.get("HOME", "")
-        clean_env["PATH"] = os.environ.get("PATH", "")
-        clean_env["SHELL"] = os.environ.get("SHELL", "/bin/zsh")
 
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             cwd=str(REPO_DIR),
-            text=True,
-            bufsize=1,
-            env=clean_env,
+            env=_BASE_CLEAN_ENV,  # Popen never mutates it: shared across clones
         )
         state.process = proc
 
-        # Stream stdout line by line (stream-json = one JSON per line)
-        for line in proc.stdout:
-            line = line.strip()
-            if not line:
-                continue
-
-            state.last_output_time = time.time()
-            state.output_lines.append(line)
-
-            # Parse stream-json events
-            try:
-                event = json.loads(line)
-                etype = event.get("type", "")
-
-                if etype == "assistant" and "message" in event:
-                    # Extract text content
-                    msg = event.get("message", {})
-                    content = msg.get("content", [])
-                    for block in content:
-                        if block.get("type") == "text":
-                            text = block.get("text", "")
-                            if text:
-                                state.last_message = text[:80]
-                                # Detect C2 DDL ready
-                                if "DDL PRONTO" in text:
-                                    state.ddl_ready = True
-                                # Push to cockpit every significant update
-                                _push_cockpit_state(state)
-
-                elif etype == "result":
-                    # Final result — contains session_id, cost, etc.
-                    state.session_id = event.get("session_id", "")
-                    state.cost_usd = event.get("cost_usd", event.get("total_cost_usd", 0.0))
-                    state.result_text = event.get("result", "")
-                    # Try to extract cost from nested structure
-                    if state.cost_usd == 0 and "usage" in event:
-                        usage = event["usage"]
-                        # Rough estimate: $15/M input, $75/M output for Opus
-                        inp = usage.get("input_tokens", 0)
-                        out = usage.get("output_tokens", 0)
-                        if "opus" in state.config.model:
-                            state.cost_usd = (inp * 15 + out * 75) / 1_000_000
-                        else:
-                            state.cost_usd = (inp * 3 + out * 15) / 1_000_000
-
-                elif etype == "error":
-                    state.error = event.get("error", {}).get("message", str(event))
-
-            except json.JSONDecodeError:
-                # Not JSON — raw text output
-                if line:
-                    state.last_message = line[:80]
+        # Drain stderr concurrently: read only after wait(), a chatty child
+        # (--verbose, tool errors) fills the 64 KB pipe and blocks forever.
+        stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_tail.extend(iter(proc.stderr.readline, b"")),
+            name=f"stderr-{state.config.id}", daemon=True,
+        )
+        stderr_thread.start()
+
+        # Stream stdout (stream-json = one JSON per line) through a selector so
+        # this thread wakes up even when the clone goes silent and can police
+        # its own heartbeat instead of blocking forever in readline().
+        fd = proc.stdout.fileno()
+        stall_reason = ""
+        buf = b""
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            while not proc.stdout.closed:  # closed by run_phase if shutdown outlives the join timeout
+                if not sel.select(timeout=STDOUT_POLL_SEC):
+                    silent = time.time() - state.last_output_time
+                    if silent > HEARTBEAT_TIMEOUT_SEC and not stall_reason:
+                        stall_reason = f"no output for {int(silent)}s"
+                        _push_cockpit_state(state, status="stalled")
+                    if silent > STALL_TERMINATE_SEC and proc.poll() is None:
+                        stall_reason = f"terminated: no output for {int(silent)}s"
+                        proc.terminate()
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break  # EOF
+                if stall_reason and proc.poll() is None:
+                    stall_reason = ""  # output resumed
+                *lines, buf = (buf + chunk).split(b"\n")
+                for raw in lines:
+                    _handle_stream_line(state, raw.decode("utf-8", errors="replace").strip())
+        _handle_stream_line(state, buf.decode("utf-8", errors="replace").strip())
 
         proc.wait()
+        # stdout closed by run_phase: a grandchild holds the pipes, stderr won't hit EOF either
+        stderr_thread.join(timeout=0 if proc.stdout.closed else 5)
         state.end_time = time.time()
 
         if proc.returncode == 0:
             state.status = "done"
             _push_cockpit_state(state)  # final push
         else:
-            stderr = proc.stderr.read() if proc.stderr else ""
+            stderr = b"".join(stderr_tail).decode("utf-8", errors="replace").strip()
             state.status = "error"
-            state.error = stderr[:200] if stderr else f"Exit code {proc.returncode}"
+            if stall_reason.startswith("terminated"):
+                state.error = stall_reason
+            else:
+                state.error = stderr[-200:] if stderr else f"Exit code {proc.returncode}"
             _push_cockpit_state(state)
 
     except FileNotFoundError:
@@ -390,8 +603,9 @@ def save_results(states: dict):
     """Save results to JSON files and optionally to iCloud."""
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
+    now = datetime.now(timezone.utc)
     summary = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now.isoformat(),
         "clones": {},
         "total_cost_usd": 0.0,
     }
@@ -413,75 +627,147 @@ def save_results(states: dict):
             "ddl_ready": state.ddl_ready,
         }
 
-        # Save individual result
-        result_path = RESULTS_DIR / f"{cid}_result.json"
-        result_path.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
-
         summary["clones"][cid] = result
         summary["total_cost_usd"] += state.cost_usd
 
-    # Save integration report
-    report_path = RESULTS_DIR / "integration_report.json"
-    report_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
-
-    # Copy to iCloud if available
-    if ICLOUD_DIR.exists():
-        icloud_report = ICLOUD_DIR / f"orchestrator_report_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-        icloud_report.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    def write_report():
+        # Integration report (streamed to the file, encoded once), then the
+        # iCloud copy if available — plain file copy, no second encode
+        report_path = RESULTS_DIR / "integration_report.json"
+        _write_json(report_path, summary)
+        if ICLOUD_DIR.exists():
+            icloud_report = ICLOUD_DIR / f"orchestrator_report_{now.astimezone().strftime('%Y%m%d_%H%M')}.json"
+            shutil.copyfile(report_path, icloud_report)
+
+    # Individual results + report written concurrently: file I/O releases the
+    # GIL, so a slow iCloud sync overlaps the local writes instead of following them
+    with ThreadPoolExecutor(max_workers=len(summary["clones"]) + 1) as pool:
+        futures = [pool.submit(_write_json, RESULTS_DIR / f"{cid}_result.json", result)
+                   for cid, result in summary["clones"].items()]
+        futures.append(pool.submit(write_report))
+    for f in futures:
+        f.result()  # re-raise the first write error, as the sequential version did
 
     return summary
 
+
+def _write_json(path: Path, obj):
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
 # ---------------------------------------------------------------------------
 # Main Orchestrator
 # ---------------------------------------------------------------------------
 
-def run_phase(phase: str, states: dict, alerts: list, dry_run: bool, start_time: float):
+# Set by the SIGINT handler only; the monitor loop notices it within one
+# tick and does the cleanup (terminate, join, save) from normal code, never
+# from inside the signal handler.
+_shutdown_requested = False
+
+
+def _request_shutdown(sig, frame):
+    global _shutdown_requested
+    if _shutdown_requested:
+        # Second Ctrl+C: cleanup is stuck somewhere — always let the user out
+        print("\n  Forced exit.", flush=True)
+        os._exit(130)
+    _shutdown_requested = True
+
+
+def run_phase(phase: str, states: dict, alerts: AlertLog, dry_run: bool, start_time: float):
     """Launch all clones in a phase and monitor them."""
     phase_clones = {cid: s for cid, s in states.items() if s.config.phase == phase}
-    threads = []
+    if not phase_clones:
+        return
 
+    # One worker per clone: each thread just blocks on its clone's stdout pipe
+    pool = ThreadPoolExecutor(max_workers=len(phase_clones), thread_name_prefix=f"phase-{phase}")
+    futures = {}
     for cid, state in phase_clones.items():
-        t = threading.Thread(target=launch_clone, args=(state, dry_run), name=f"clone-{cid}", daemon=True)
-        threads.append(t)
-        t.start()
+        futures[pool.submit(launch_clone, state, dry_run)] = cid
         alerts.append(f"{state.config.name} launched ({state.config.model})")
+    _monitor_phase(phase_clones, states, alerts, start_time, futures)
+    if not _shutdown_requested:
+        pool.shutdown()  # every future is done: returns at once
+    else:
+        _stop_clones(phase_clones)
+        pool.shutdown(wait=False, cancel_futures=True)
+        # A grandchild of `claude` (MCP server, Bash tool) can hold the stdout pipe
+        # open past the kill, so EOF may never come: bound the join, then close
+        # the pipe ourselves — the clone thread sees it on its next poll and exits.
+        _, pending = wait(futures, timeout=CLONE_JOIN_TIMEOUT_SEC)
+        for f in pending:
+            proc = phase_clones[futures[f]].process
+            if proc and proc.stdout:
+                proc.stdout.close()
+        if pending:
+            wait(pending, timeout=STDOUT_POLL_SEC + 1)  # let them record their final status
+
+    # An exception that escaped _run_clone (prompt decode, cockpit push...) only
+    # lives in its future: surface it, or the clone stays pending/running
+    for f, cid in futures.items():
+        exc = f.exception() if f.done() and not f.cancelled() else None
+        if exc is not None:
+            state = phase_clones[cid]
+            state.status = "error"
+            state.error = str(exc)[:200] or type(exc).__name__
+            alerts.append(f"❌ {state.config.name} crashed: {state.error}")
+
+
+def _stop_clones(clones: dict, grace_sec: float = 5.0):
+    """SIGTERM every live clone process, SIGKILL whatever outlives the grace period."""
+    print("\n\n  Stopping all clones...")
+    procs = [s.process for s in clones.values() if s.process and s.process.poll() is None]
+    for proc in procs:
+        proc.terminate()
+    for proc in procs:
+        try:
+            proc.wait(timeout=grace_sec)
+        except subprocess.TimeoutExpired:
+            proc.kill()
 
-    # Monitor loop
+
+def _monitor_phase(phase_clones: dict, states: dict, alerts: AlertLog, start_time: float, futures: dict):
+    """Render the dashboard until every clone future of the phase is done."""
     if HAS_RICH:
         console = Console()
         with Live(render_dashboard_rich(console, states, start_time, alerts),
-                  console=console, refresh_per_second=1, transient=True) as live:
-            while any(t.is_alive() for t in threads):
+                  console=console, auto_refresh=False, transient=True) as live:
+            live.refresh()
+            last_key, last_draw = dashboard_key(states, alerts), time.time()
+            while not all(f.done() for f in futures) and not _shutdown_requested:
                 # Check heartbeats
                 for cid, state in phase_clones.items():
                     if state.status == "running":
                         since = time.time() - state.last_output_time
                         if since > HEARTBEAT_TIMEOUT_SEC:
-                            hb_alert = f"⚠️ {state.config.name} — no output for {int(since)}s"
-                            if hb_alert not in alerts:
-                                alerts.append(hb_alert)
+                            # One alert per stall (keyed on the last output), not one per tick
+                            alerts.add(f"⚠️ {state.config.name} — no output for {int(since)}s",
+                                       key=f"hb:{cid}:{state.last_output_time}")
 
                 # Check DDL ready (C2)
                 c2_state = states.get("c2")
                 if c2_state and c2_state.ddl_ready:
-                    ddl_alert = "🔔 C2 DDL PRONTO — esegui scripts/go_live_ddl.sql su Supabase prima del push!"
-                    if ddl_alert not in alerts:
-                        alerts.append(ddl_alert)
+                    alerts.add("🔔 C2 DDL PRONTO — esegui scripts/go_live_ddl.sql su Supabase prima del push!")
 
-                live.update(render_dashboard_rich(console, states, start_time, alerts))
-                time.sleep(1)
+                key = dashboard_key(states, alerts)
+                if key != last_key or time.time() - last_draw >= DASHBOARD_FORCE_REFRESH_SEC:
+                    live.update(render_dashboard_rich(console, states, start_time, alerts), refresh=True)
+                    last_key, last_draw = key, time.time()
+                wait_ui_events(1.0)
 
             # Final render
-            live.update(render_dashboard_rich(console, states, start_time, alerts))
+            live.update(render_dashboard_rich(console, states, start_time, alerts), refresh=True)
     else:
-        while any(t.is_alive() for t in threads):
-            render_dashboard_plain(states, start_time, alerts)
-            time.sleep(3)
+        last_key, last_draw = None, 0.0
+        while not all(f.done() for f in futures) and not _shutdown_requested:
+            key = dashboard_key(states, alerts)
+            if key != last_key or time.time() - last_draw >= DASHBOARD_FORCE_REFRESH_SEC:
+                render_dashboard_plain(states, start_time, alerts)
+                last_key, last_draw = key, time.time()
+            wait_ui_events(3.0)
         render_dashboard_plain(states, start_time, alerts)
 
-    for t in threads:
-        t.join(timeout=5)
-
 def main():
     parser = argparse.ArgumentParser(description="BTC Predictor Bot — Multi-Clone Orchestrator")
     parser.add_argument("--dry-run", action="store_true", help="Don't actually launch clones")
@@ -521,7 +807,7 @@ def main():
             sys.exit(1)
         states = {cid: states[cid]}
 
-    alerts = []
+    alerts = AlertLog()
     start_time = time.time()
 
     # Pre-launch checks
@@ -563,18 +849,16 @@ def main():
             print("\n  Annullato.")
             sys.exit(0)
 
-    # Handle Ctrl+C gracefully
-    def signal_handler(sig, frame):
-        print("\n\n  Stopping all clones...")
-        for state in states.values():
-            if state.process and state.process.poll() is None:
-                state.process.terminate()
-        # Save partial results
-        save_results(states)
-        print("  Partial results saved.")
-        sys.exit(0)
+    # Handle Ctrl+C gracefully: the handler only raises a flag, run_phase stops
+    # the clones and we save here, after any in-flight write has completed
+    def exit_if_stopped():
+        if _shutdown_requested:
+            save_results(states)
+            _flush_cockpit()
+            print("  Partial results saved.")
+            sys.exit(0)
 
-    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGINT, _request_shutdown)
 
     # --- PHASE A: Read-heavy clones ---
     if not args.phase_b_only:
@@ -582,6 +866,7 @@ def main():
         if phase_a_clones:
             alerts.append("=== PHASE A START (read-heavy: C3, C4, C5, C6) ===")
             run_phase("A", states, alerts, args.dry_run, start_time)
+            exit_if_stopped()
 
             phase_a_done = sum(1 for s in phase_a_clones.values() if s.status == "done")
             phase_a_errors = sum(1 for s in phase_a_clones.values() if s.status == "error")
@@ -594,14 +879,19 @@ def main():
                         print(f"    {s.config.name}: {s.error}")
                 if not args.dry_run:
                     print("\n  Continue to Phase B? (y/n) ", end="")
+                    # Plain KeyboardInterrupt at the prompt: the flag handler can't break input()
+                    signal.signal(signal.SIGINT, signal.default_int_handler)
                     try:
                         answer = input().strip().lower()
+                        signal.signal(signal.SIGINT, _request_shutdown)
                         if answer != "y":
                             save_results(states)
+                            _flush_cockpit()
                             print("  Results saved. Phase B skipped.")
                             sys.exit(0)
                     except (EOFError, KeyboardInterrupt):
                         save_results(states)
+                        _flush_cockpit()
                         sys.exit(0)
 
     # --- PHASE B: Write-heavy clones ---
@@ -610,12 +900,14 @@ def main():
         if phase_b_clones:
             alerts.append("=== PHASE B START (write-heavy: C1, C2) ===")
             run_phase("B", states, alerts, args.dry_run, start_time)
+            exit_if_stopped()
 
             phase_b_done = sum(1 for s in phase_b_clones.values() if s.status == "done")
             alerts.append(f"=== PHASE B DONE: {phase_b_done} ok ===")
 
     # --- Save results ---
     summary = save_results(states)
+    _flush_cockpit()
 
     # --- Final report ---
     elapsed = time.time() - start_time
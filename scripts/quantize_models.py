@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+quantize_models.py — Export XGBoost models to ONNX + INT8 dynamic quantization
+
+Runs after train_xgboost.py (retrain 03:00 UTC). For each live model in models/:
+  1. xgb_<name>.pkl  -> xgb_<name>.onnx       (onnxmltools, FP32)
+  2. xgb_<name>.onnx -> xgb_<name>.int8.onnx  (onnxruntime quantize_dynamic, QInt8)
+  3. parity check vs the .pkl on sample rows — the .int8.onnx is kept only if
+     max |Δ P(class 1)| <= --tol
+
+Note: dynamic quantization only rewrites MatMul/Gemm weights; a tree ensemble
+is a single TreeEnsembleClassifier op, so the INT8 artifact is mostly the ONNX
+runtime win (no Python/XGBoost booster on the hot path). The parity check is
+the gate either way. app.py serves it only with XGB_ONNX=true and falls back
+to the .pkl if it is missing.
+
+Requires (not in requirements.txt): pip install onnxmltools onnxruntime
+
+Usage:
+  python3 scripts/quantize_models.py [--models ./models] [--tol 0.02]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+from joblib import load as joblib_load
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_NAMES = ("direction", "correctness")
+
+
+def _sample_rows(models_dir, n_features, n=512, seed=42):
+    """Parity rows: datasets/features.csv (columns from models_dir's metadata) if present,
+    else random in-range values."""
+    meta_path = os.path.join(models_dir, "model_metadata.json")
+    csv_path = os.path.join(REPO, "datasets", "features.csv")
+    if os.path.exists(csv_path) and os.path.exists(meta_path):
+        import pandas as pd
+        with open(meta_path) as f:
+            features = json.load(f).get("features", [])
+        df = pd.read_csv(csv_path)
+        if len(features) == n_features and set(features) <= set(df.columns):
+            return df[features].dropna().to_numpy(dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1.0, 100.0, size=(n, n_features)).astype(np.float32)
+
+
+def quantize_model(models_dir, name, tol):
+    from onnxmltools import convert_xgboost
+    from onnxmltools.convert.common.data_types import FloatTensorType
+    from onnxruntime import InferenceSession
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    pkl_path  = os.path.join(models_dir, f"xgb_{name}.pkl")
+    fp32_path = os.path.join(models_dir, f"xgb_{name}.onnx")
+    int8_path = os.path.join(models_dir, f"xgb_{name}.int8.onnx")
+
+    # Never leave a stale INT8 model around for app.py to pick up
+    if os.path.exists(int8_path):
+        os.remove(int8_path)
+    if not os.path.exists(pkl_path):
+        print(f"  [SKIP] {pkl_path} not found")
+        return False
+
+    model = joblib_load(pkl_path)
+    n_features = model.n_features_in_
+    onnx_model = convert_xgboost(model, initial_types=[("input", FloatTensorType([None, n_features]))])
+    with open(fp32_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    X = _sample_rows(models_dir, n_features)
+    sess = InferenceSession(int8_path, providers=["CPUExecutionProvider"])
+    prob_name = sess.get_outputs()[1].name
+    onnx_p = np.asarray(sess.run([prob_name], {sess.get_inputs()[0].name: X})[0])[:, 1]
+    ref_p = model.predict_proba(X)[:, 1]
+    max_diff = float(np.max(np.abs(onnx_p - ref_p)))
+
+    kb = lambda p: os.path.getsize(p) / 1024
+    print(f"  xgb_{name}: pkl {kb(pkl_path):.0f} KB | onnx {kb(fp32_path):.0f} KB | "
+          f"int8 {kb(int8_path):.0f} KB | max |dP| {max_diff:.5f} on {len(X)} rows")
+    if max_diff > tol:
+        os.remove(int8_path)
+        print(f"  [FAIL] xgb_{name}: parity {max_diff:.5f} > tol {tol} — INT8 model discarded")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export XGBoost models to INT8 ONNX")
+    parser.add_argument("--models", default=os.path.join(REPO, "models"), help="Directory with xgb_*.pkl")
+    parser.add_argument("--tol", type=float, default=0.02, help="Max allowed |dP| vs the .pkl model")
+    args = parser.parse_args()
+
+    try:
+        import onnxmltools  # noqa: F401
+        import onnxruntime  # noqa: F401
+    except ImportError as e:
+        print(f"[ERROR] {e} — pip install onnxmltools onnxruntime")
+        sys.exit(1)
+
+    print("Quantizing XGBoost models...")
+    ok = [quantize_model(args.models, name, args.tol) for name in MODEL_NAMES]
+    sys.exit(0 if all(ok) else 1)
+
+
+if __name__ == "__main__":
+    main()
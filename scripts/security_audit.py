@@ -12,9 +12,18 @@ import os
 import re
 import sys
 import json
+import mmap
 import time
+from bisect import insort
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:  # optional — faster NDJSON lines; the audit itself stays dependency-free
+    import orjson
+    _dumps_line = lambda obj: orjson.dumps(obj).decode()
+except ImportError:
+    _dumps_line = lambda obj: json.dumps(obj, ensure_ascii=False)
+
 # ── Config ────────────────────────────────────────────────────────────────────
 
 REPO_ROOT = Path(__file__).parent.parent.resolve()
@@ -26,6 +35,9 @@ SKIP_DIRS = {
 SKIP_EXTS = {".pkl", ".pyc", ".pyo", ".jsonl", ".png", ".jpg", ".jpeg",
              ".gif", ".ico", ".svg", ".woff", ".woff2", ".ttf", ".eot",
              ".pdf", ".zip", ".gz", ".tar", ".bin"}
+MAX_FILE_BYTES = 2 * 1024 * 1024  # bundled JS/CSS blobs, dumps — not hand-written source
+MMAP_MIN_BYTES = 64 * 1024        # below this a plain read() is cheaper than mmap
+PARALLEL_MIN_FILES = 100          # below this, process spawn costs more than the scan
 
 # ── Secret Patterns ──────────────────────────────────────────────────────────
 
@@ -49,6 +61,13 @@ SECRET_PATTERNS = [
     # Private key PEM header
     (r"-----BEGIN (RSA |EC |OPENSSH )?PRIVATE KEY-----", "PEM_PRIVATE_KEY", "CRITICAL"),
 ]
+# Fused alternation: one search per line rejects clean lines; hits are then
+# resolved against the individual patterns to keep the list order as priority.
+SECRET_RE = re.compile("|".join(f"(?P<P{i}>{pat})" for i, (pat, _, _) in enumerate(SECRET_PATTERNS)))
+_SECRET_RES = [(re.compile(pat), label, severity) for pat, label, severity in SECRET_PATTERNS]
+# Bytes-level prefilter over the whole file: the literal every pattern above
+# needs (HEX_64CHAR has none → hex run). Only lines it hits are decoded.
+_SECRET_HINT_RE = re.compile(rb"eyJ|sk-|xox|-----BEGIN|password|REDACT|://|[0-9a-fA-F]{8}")
 
 # Lines that are clearly false positives (env var reads, comments, docstrings)
 FALSE_POSITIVE_PATTERNS = [
@@ -64,39 +83,142 @@ FALSE_POSITIVE_PATTERNS = [
     re.compile(r"example|placeholder|dummy|sample|test_key|fake"),
     re.compile(r"eyJ[A-Za-z0-9_+/=]{0,10}$"),  # too short to be real
 ]
+FALSE_POSITIVE_RE = re.compile("|".join(f"(?:{fp.pattern})" for fp in FALSE_POSITIVE_PATTERNS))
 
 GITIGNORE_REQUIRED = [
-    (".env",          r"^\.env$|^\.env\b"),
-    ("*.pkl",         r"^\*\.pkl"),
-    ("__pycache__",   r"^__pycache__"),
-    (".DS_Store",     r"^\.DS_Store"),
-    ("node_modules",  r"^node_modules"),
-    ("*.log",         r"^\*\.log"),
+    (".env",          re.compile(r"^\.env$|^\.env\b", re.MULTILINE)),
+    ("*.pkl",         re.compile(r"^\*\.pkl", re.MULTILINE)),
+    ("__pycache__",   re.compile(r"^__pycache__", re.MULTILINE)),
+    (".DS_Store",     re.compile(r"^\.DS_Store", re.MULTILINE)),
+    ("node_modules",  re.compile(r"^node_modules", re.MULTILINE)),
+    ("*.log",         re.compile(r"^\*\.log", re.MULTILINE)),
 ]
 
+# HTTP header names are case-insensitive — a lower-case wildcard header counts too
+CORS_RE = re.compile(r'Access-Control-Allow-Origin["\s:]+\*', re.IGNORECASE)
+_CORS_RE_B = re.compile(CORS_RE.pattern.encode(), re.IGNORECASE)
+
 APP_PY = REPO_ROOT / "app.py"
 GITIGNORE = REPO_ROOT / ".gitignore"
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _iter_source_files():
-    """Yield (path, lines) for all text files in repo."""
-    for root, dirs, files in os.walk(REPO_ROOT):
-        # Prune skip dirs in-place
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        for fname in files:
-            p = Path(root) / fname
-            if p.suffix.lower() in SKIP_EXTS:
+def _iter_source_files(root=None):
+    """Yield (path, size) for all text files in repo.
+
+    os.scandir's DirEntry carries the type from the directory listing, so only
+    candidate files cost a stat() call — and SKIP_DIRS are never entered.
+    """
+    try:
+        it = os.scandir(REPO_ROOT if root is None else root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from _iter_source_files(entry.path)
+                continue
+            if os.path.splitext(entry.name)[1].lower() in SKIP_EXTS:
                 continue
             try:
-                text = p.read_text(encoding="utf-8", errors="replace")
-                yield p, text.splitlines()
-            except Exception:
+                if not entry.is_file():
+                    continue
+                size = entry.stat().st_size
+            except OSError:
                 continue
+            if size <= MAX_FILE_BYTES:
+                yield Path(entry.path), size
+
+
+def _scan_one_file(entry):
+    """Secret + CORS scan of one file → list of findings.
+
+    Top-level so pool workers can run it; larger files are mmap'd, not read.
+    Only opening/reading the file is guarded: an unreadable file becomes an
+    INFO finding, never a silent skip, and scanner errors propagate.
+    """
+    path, size = entry
+    try:
+        f = open(path, "rb")
+    except OSError as e:
+        return [_unreadable(path, e)]
+    with f:
+        if size < MMAP_MIN_BYTES:
+            try:
+                buf = f.read()
+            except OSError as e:
+                return [_unreadable(path, e)]
+            return [*check_secrets(path, buf), *check_cors(path, buf)]
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:  # ValueError: file emptied since stat()
+            return [_unreadable(path, e)]
+        with mm:
+            return [*check_secrets(path, mm), *check_cors(path, mm)]
+
+
+def _unreadable(path, exc):
+    return {
+        "check": "FILE_UNREADABLE",
+        "severity": "INFO",
+        "file": _rel(path),
+        "line": 0,
+        "label": "NOT_SCANNED",
+        "snippet": f"Could not read file, not scanned: {exc}",
+    }
+
+
+class _LineCounter:
+    """Offset → 1-based line number for a str/bytes/mmap buffer.
+
+    Offsets arrive in increasing order from a left-to-right scan, so each call
+    only counts the newlines since the previous one: O(file) in total however
+    many hits there are, with no per-file offset table to build up front.
+    """
+
+    __slots__ = ("buf", "nl", "lineno", "pos")
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.nl = "\n" if isinstance(buf, str) else b"\n"
+        self.lineno, self.pos = 1, 0
+
+    def at(self, offset):
+        if offset < self.pos:  # out-of-order caller: recount from the top
+            self.lineno, self.pos = 1, 0
+        self.lineno += self.buf[self.pos:offset].count(self.nl)  # mmap has no count()
+        self.pos = offset
+        return self.lineno
+
+
+def _hit_lines(buf, rx):
+    """Yield (lineno, line) for every line of buf on which bytes regex rx matches.
+
+    Only those lines are decoded; the caller re-checks them at str level, so a
+    match running across a newline just costs one extra look at a line.
+    """
+    n = len(buf)
+    pos = 0
+    lines = _LineCounter(buf)
+    while pos < n:
+        m = rx.search(buf, pos)
+        if m is None:
+            return
+        hit = m.start()
+        start = buf.rfind(b"\n", 0, hit) + 1
+        end = buf.find(b"\n", hit)
+        if end == -1:
+            end = n
+        line = buf[start:end]
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        yield lines.at(start), line.decode("utf-8", errors="replace")
+        pos = end + 1
 
 
 def _is_false_positive(line: str) -> bool:
-    return any(fp.search(line) for fp in FALSE_POSITIVE_PATTERNS)
+    return FALSE_POSITIVE_RE.search(line) is not None
 
 
 def _rel(path: Path) -> str:
@@ -108,92 +230,82 @@ def _rel(path: Path) -> str:
 
 # ── Check 1: Hardcoded Secrets ─────────────────────────────────────────────
 
-def check_secrets(files_cache):
-    findings = []
-    for path, lines in files_cache:
-        rel = _rel(path)
-        # Skip .env.example (it's the template — allowed to have sk-ant-api03-...)
-        if rel == ".env.example":
+def check_secrets(path, buf):
+    rel = _rel(path)
+    # Skip .env.example (it's the template — allowed to have sk-ant-api03-...)
+    if rel == ".env.example":
+        return
+    for lineno, line in _hit_lines(buf, _SECRET_HINT_RE):
+        if not SECRET_RE.search(line) or _is_false_positive(line):
             continue
-        for lineno, line in enumerate(lines, 1):
-            if _is_false_positive(line):
-                continue
-            for pattern, label, severity in SECRET_PATTERNS:
-                m = re.search(pattern, line)
-                if m:
-                    snippet = line.strip()[:120]
-                    findings.append({
-                        "check": "HARDCODED_SECRET",
-                        "severity": severity,
-                        "file": rel,
-                        "line": lineno,
-                        "label": label,
-                        "snippet": snippet,
-                    })
-                    break  # one finding per line
-    return findings
+        for rx, label, severity in _SECRET_RES:
+            if rx.search(line):
+                snippet = line.strip()[:120]
+                yield {
+                    "check": "HARDCODED_SECRET",
+                    "severity": severity,
+                    "file": rel,
+                    "line": lineno,
+                    "label": label,
+                    "snippet": snippet,
+                }
+                break  # one finding per line
 
 
 # ── Check 2: .gitignore Completeness ─────────────────────────────────────────
 
 def check_gitignore():
-    findings = []
     if not GITIGNORE.exists():
-        findings.append({
+        yield {
             "check": "GITIGNORE_MISSING",
             "severity": "CRITICAL",
             "file": ".gitignore",
             "line": 0,
             "label": "GITIGNORE_ABSENT",
             "snippet": ".gitignore does not exist",
-        })
-        return findings
+        }
+        return
 
     content = GITIGNORE.read_text(encoding="utf-8")
-    lines = content.splitlines()
 
-    for label, pattern in GITIGNORE_REQUIRED:
-        rx = re.compile(pattern, re.MULTILINE)
+    for label, rx in GITIGNORE_REQUIRED:
         if not rx.search(content):
             # Check also with leading slash variant
-            findings.append({
+            yield {
                 "check": "GITIGNORE_INCOMPLETE",
                 "severity": "MEDIUM",
                 "file": ".gitignore",
                 "line": 0,
                 "label": f"MISSING_{label.replace('*','STAR').replace('.','DOT')}",
                 "snippet": f"No rule matching '{label}' found in .gitignore",
-            })
-    return findings
+            }
 
 
 # ── Check 3: CSP — unsafe-eval / unsafe-inline ───────────────────────────────
 
-def check_csp():
-    findings = []
-    if not APP_PY.exists():
-        return findings
-    lines = APP_PY.read_text(encoding="utf-8", errors="replace").splitlines()
+def check_csp(app_entry):
+    if app_entry is None:
+        return
+    _text, lines = app_entry
     for lineno, line in enumerate(lines, 1):
         if "'unsafe-eval'" in line:
-            findings.append({
+            yield {
                 "check": "CSP_UNSAFE",
                 "severity": "HIGH",
                 "file": "app.py",
                 "line": lineno,
                 "label": "CSP_UNSAFE_EVAL",
                 "snippet": line.strip()[:120],
-            })
+            }
         if "'unsafe-inline'" in line:
-            findings.append({
+            yield {
                 "check": "CSP_UNSAFE",
                 "severity": "MEDIUM",
                 "file": "app.py",
                 "line": lineno,
                 "label": "CSP_UNSAFE_INLINE",
                 "snippet": line.strip()[:120],
-            })
-    return findings
+            }
 
 
 # ── Check 4: Unprotected POST Endpoints ──────────────────────────────────────
@@ -215,71 +327,72 @@ PROTECTION_FNS = [
     "_check_turnstile",
 ]
 
-def check_unprotected_post():
-    findings = []
-    if not APP_PY.exists():
-        return findings
-    lines = APP_PY.read_text(encoding="utf-8", errors="replace").splitlines()
-    route_re = re.compile(r'@app\.route\("([^"]+)".*?methods.*?["\']POST["\']', re.IGNORECASE)
-    for lineno, line in enumerate(lines, 1):
-        m = route_re.search(line)
-        if not m:
-            # Also handle multi-arg route decorators
-            m2 = re.search(r'@app\.route\("([^"]+)"', line)
-            if m2 and lineno + 1 <= len(lines):
-                # Check if next line has POST
-                next_line = lines[lineno] if lineno < len(lines) else ""
-                if "POST" not in line and "POST" not in next_line:
-                    continue
-                route = m2.group(1)
-            else:
-                continue
-        else:
-            route = m.group(1)
+# POST decorators, matched over the whole file: [^)] keeps the match inside the
+# decorator's parentheses but lets it span lines (multi-line route decorators).
+ROUTE_RE = re.compile(r'@app\.route\("([^"]+)"[^)]*?methods[^)]*?["\']POST["\']', re.IGNORECASE)
+PROTECTION_RE = re.compile("|".join(re.escape(fn) for fn in PROTECTION_FNS))
 
+
+def check_unprotected_post(app_entry):
+    if app_entry is None:
+        return
+    text, lines = app_entry
+    line_of = _LineCounter(text)
+    for m in ROUTE_RE.finditer(text):
+        lineno = line_of.at(m.start())
+        route = m.group(1)
         if route in INTENTIONALLY_PUBLIC_POST:
             continue
 
         # Check the next 15 lines for any protection function
         window = lines[lineno: lineno + 15]
-        protected = any(
-            fn in wline for fn in PROTECTION_FNS for wline in window
-        )
-        if not protected:
-            findings.append({
+        if not PROTECTION_RE.search("\n".join(window)):
+            yield {
                 "check": "UNPROTECTED_POST",
                 "severity": "MEDIUM",
                 "file": "app.py",
                 "line": lineno,
                 "label": f"NO_AUTH: {route}",
-                "snippet": line.strip()[:120],
-            })
-    return findings
+                "snippet": lines[lineno - 1].strip()[:120],
+            }
 
 
 # ── Check 5: CORS Wildcard ────────────────────────────────────────────────────
 
-def check_cors(files_cache):
-    findings = []
-    cors_re = re.compile(r'Access-Control-Allow-Origin["\s:]+\*')
-    for path, lines in files_cache:
-        rel = _rel(path)
-        for lineno, line in enumerate(lines, 1):
-            if cors_re.search(line):
-                findings.append({
-                    "check": "CORS_WILDCARD",
-                    "severity": "HIGH",
-                    "file": rel,
-                    "line": lineno,
-                    "label": "CORS_ALLOW_ALL",
-                    "snippet": line.strip()[:120],
-                })
-    return findings
+def check_cors(path, buf):
+    rel = _rel(path)
+    for lineno, line in _hit_lines(buf, _CORS_RE_B):
+        if CORS_RE.search(line):
+            yield {
+                "check": "CORS_WILDCARD",
+                "severity": "HIGH",
+                "file": rel,
+                "line": lineno,
+                "label": "CORS_ALLOW_ALL",
+                "snippet": line.strip()[:120],
+            }
 
 
 # ── Runner ────────────────────────────────────────────────────────────────────
 
 SEVERITY_ORDER = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3, "INFO": 4}
+TOP_FINDINGS = 200  # most severe findings kept for the human-readable list
+
+
+def _iter_findings(files, app_entry):
+    """All findings, in scan order — file scans are consumed as workers finish them."""
+    yield from check_gitignore()
+    yield from check_csp(app_entry)
+    yield from check_unprotected_post(app_entry)
+    # Per-file scans are independent and CPU-bound → shard across processes
+    workers = min(os.cpu_count() or 1, 8)
+    if len(files) < PARALLEL_MIN_FILES or workers < 2:
+        for result in map(_scan_one_file, files):
+            yield from result
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_scan_one_file, files, chunksize=16):
+                yield from result
 
 
 def main():
@@ -290,47 +403,49 @@ def main():
     print(f"Started: {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}")
     print("=" * 60)
 
-    # Load all files once
-    print("\n[*] Scanning source files...")
-    files_cache = list(_iter_source_files())
-    print(f"    {len(files_cache)} files scanned.")
+    files = list(_iter_source_files())
 
-    all_findings = []
-    all_findings += check_secrets(files_cache)
-    all_findings += check_gitignore()
-    all_findings += check_csp()
-    all_findings += check_unprotected_post()
-    all_findings += check_cors(files_cache)
+    # the app.py checks are line-oriented — the only file decoded in full
+    app_entry = None
+    if any(p == APP_PY for p, _ in files):
+        text = APP_PY.read_text(encoding="utf-8", errors="replace")
+        app_entry = (text, text.splitlines())
 
-    # Sort by severity
-    all_findings.sort(key=lambda f: (SEVERITY_ORDER.get(f["severity"], 9), f["file"], f["line"]))
+    # ── NDJSON findings: one line each as found — memory stays flat ─────────
+    print("\n[*] Scanning source files...")
+    counts = dict.fromkeys(["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"], 0)
+    top = []  # sorted (key, seq, finding), capped at TOP_FINDINGS
+    for seq, f in enumerate(_iter_findings(files, app_entry)):
+        print(_dumps_line(f))
+        counts[f["severity"]] = counts.get(f["severity"], 0) + 1
+        insort(top, ((SEVERITY_ORDER.get(f["severity"], 9), f["file"], f["line"]), seq, f))
+        if len(top) > TOP_FINDINGS:
+            top.pop()
+    total = sum(counts.values())
+    print(f"    {len(files)} files scanned.")
 
-    # ── JSON report ──────────────────────────────────────────────────────────
     report = {
         "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
         "repo": str(REPO_ROOT),
-        "files_scanned": len(files_cache),
-        "total_findings": len(all_findings),
-        "summary": {},
-        "findings": all_findings,
+        "files_scanned": len(files),
+        "total_findings": total,
+        "summary": counts,
     }
-    for sev in ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]:
-        report["summary"][sev] = sum(1 for f in all_findings if f["severity"] == sev)
-
-    print("\n" + json.dumps(report, indent=2))
+    print(_dumps_line(report))
 
     # ── Human-readable summary ───────────────────────────────────────────────
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
     for sev in ["CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO"]:
-        count = report["summary"][sev]
+        count = counts[sev]
         icon = {"CRITICAL": "🔴", "HIGH": "🟠", "MEDIUM": "🟡", "LOW": "🟢", "INFO": "ℹ️"}.get(sev, " ")
         print(f"  {icon} {sev:8s}: {count}")
 
-    if all_findings:
-        print("\nFINDINGS:")
-        for f in all_findings:
+    if top:
+        shown = f" (top {len(top)} of {total})" if total > len(top) else ""
+        print(f"\nFINDINGS{shown}:")
+        for _, _, f in top:
             print(f"  [{f['severity']:8s}] {f['file']}:{f['line']}  {f['label']}")
             print(f"             → {f['snippet'][:80]}")
     else:
@@ -340,7 +455,7 @@ def main():
     print(f"\nCompleted in {elapsed:.1f}s")
     print("=" * 60)
 
-    has_critical = report["summary"]["CRITICAL"] > 0
+    has_critical = counts["CRITICAL"] > 0
     if has_critical:
         print("\n⛔ ALERT: CRITICAL findings detected — exit code 1")
     else:
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Update wf01B: fix confidence stuck at 0.55 + reduce blocked hours.
+
+Both fixes go out in ONE GET + ONE PUT (see _n8n_client.edit_workflow).
+--mode picks how the prompt's confidence calibration section is rewritten:
+
+  replace  swap the exact old section for NEW_CAL (update_wf01b_prompt.py)
+  splice   replace everything from the section header up to ANTI-BIAS CHECK
+           with SPLICE_CAL, whatever it currently says (update_wf01b_v2.py)
+
+Usage:
+  python3 scripts/update_wf01b.py [--mode replace|splice]
+"""
+import argparse
+import re
+import sys
+
+import _n8n_client
+
+WF_ID = 'OMgFa9Min4qXRnhq'  # 01B_BTC_Prediction_Bot
+
+# ── Prompt: confidence calibration section ──
+OLD_CAL = (
+    "\u2501\u2501\u2501 CONFIDENCE CALIBRATION RULES \u2501\u2501\u2501\n"
+    "RSI ESTREMO NON ABBASSA LA CONFIDENCE \u2014 regole obbligatorie:\n"
+    "\n"
+    "1. RSI < 25 (ipervenduto estremo) + EMA BEAR trend \u2192 il segnale DOWN \u00e8 VALIDO.\n"
+    "   L'RSI basso indica pressione di vendita prolungata, non un reversal imminente nel breve.\n"
+    "   NON abbassare confidence solo perch\u00e9 RSI \u00e8 basso con EMA BEAR.\n"
+    "\n"
+    "2. RSI > 75 (ipercomprato estremo) + EMA BULL trend \u2192 il segnale UP \u00e8 VALIDO.\n"
+    "   Stesso principio: non abbassare confidence con EMA BULL solo per RSI alto.\n"
+    "\n"
+    "3. RSI neutro (44\u201356) = mercato laterale/indeciso \u2192 abbassare confidence a 0.50-0.55.\n"
+    "\n"
+    "4. Regola d'oro: confidence PROPORZIONALE alla forza del segnale quando EMA, MTF consensus\n"
+    "   e taker flow concordano, INDIPENDENTEMENTE dal valore assoluto di RSI.\n"
+    "\n"
+    "5. Range confidence:\n"
+    "   \u2022 0.50-0.55 = segnali contradditori, bassa convinzione\n"
+    "   \u2022 0.56-0.62 = segnale chiaro con qualche dissonanza\n"
+    "   \u2022 0.63-0.70 = segnale forte e concorde su 3+ dimensioni\n"
+    "   \u2022 0.71-0.80 = convergenza eccezionale di tutti gli indicatori (raro)"
+)
+
+NEW_CAL = (
+    "\u2501\u2501\u2501 CONFIDENCE CALIBRATION RULES \u2501\u2501\u2501\n"
+    "CONFIDENCE = how strong the signal is. Use the FULL range 0.50-0.90.\n"
+    "\n"
+    "1. RSI extreme values CONFIRM the trend, they do NOT lower confidence:\n"
+    "   \u2022 RSI < 25 + EMA BEAR \u2192 strong DOWN signal, confidence should be HIGH (0.65+)\n"
+    "   \u2022 RSI > 75 + EMA BULL \u2192 strong UP signal, confidence should be HIGH (0.65+)\n"
+    "   \u2022 RSI near 50 \u2192 neutral, use other indicators to decide\n"
+    "\n"
+    "2. Confidence must be PROPORTIONAL to signal strength:\n"
+    "   \u2022 0.50-0.54 = genuinely conflicting signals, no clear direction\n"
+    "   \u2022 0.55-0.62 = mild directional signal, some conflicting indicators\n"
+    "   \u2022 0.63-0.72 = clear signal supported by 3+ indicators (EMA + MTF + taker flow)\n"
+    "   \u2022 0.73-0.85 = strong convergence across technicals, derivatives, AND sentiment\n"
+    "   \u2022 0.86-0.90 = exceptional convergence with volume spike confirmation (rare but valid)\n"
+    "\n"
+    "3. NEVER default to 0.55. If you find yourself outputting 0.55, STOP and ask:\n"
+    "   \"Is this genuinely a 50/50 signal, or am I being artificially conservative?\"\n"
+    "   Most market conditions have SOME directional bias \u2014 reflect it.\n"
+    "\n"
+    "4. force_no_bet = true means technicals are mixed, but you STILL must provide your best\n"
+    "   direction estimate with honest confidence. Do NOT auto-cap at 0.55."
+)
+
+SPLICE_CAL = (
+    "CONFIDENCE CALIBRATION RULES \u2501\u2501\u2501\n"
+    "CONFIDENCE = how strong the signal is. Use the FULL range 0.50-0.90.\n\n"
+    "1. RSI extreme values CONFIRM the trend:\n"
+    "   - RSI < 25 + EMA BEAR = strong DOWN, confidence 0.65+\n"
+    "   - RSI > 75 + EMA BULL = strong UP, confidence 0.65+\n"
+    "   - RSI near 50 = neutral, use other indicators\n\n"
+    "2. Confidence PROPORTIONAL to signal strength:\n"
+    "   - 0.50-0.54 = genuinely conflicting signals\n"
+    "   - 0.55-0.62 = mild directional signal\n"
+    "   - 0.63-0.72 = clear signal, 3+ indicators agree\n"
+    "   - 0.73-0.85 = strong convergence across all dimensions\n"
+    "   - 0.86-0.90 = exceptional convergence (rare but valid)\n\n"
+    "3. NEVER default to 0.55. Ask yourself: is this truly 50/50?\n"
+    "   Most conditions have SOME directional bias - reflect it.\n\n"
+    "4. force_no_bet does NOT cap confidence. Give honest estimate.\n\n"
+)
+
+OLD_RANGE = '"confidence": <number 0.50\u20130.80>'
+NEW_RANGE = '"confidence": <number 0.50\u20130.90>'
+
+# ── Anti-Noise Filter: blocked hours ──
+# Matches whatever list the node holds now, tolerant of spacing / trailing commas
+_BLOCKED_HOURS_RE = re.compile(r'BLOCKED_HOURS_UTC\s*=\s*\[([^\]]*)\]\s*;')
+BLOCKED_HOURS = [5, 10]
+NEW_HOURS = 'BLOCKED_HOURS_UTC = [5, 10];  // Only hours with WR < 15% (real data: 5h=0%, 10h=10%)'
+
+
+def _splice(text, old, new):
+    """Replace the first `old` in text; returns text itself when it is absent."""
+    i = text.find(old)
+    if i < 0:
+        return text
+    return text[:i] + new + text[i + len(old):]
+
+
+def _set_prompt(node, prompt, new_prompt):
+    if new_prompt is prompt:
+        print("  WARNING: Prompt not changed (old section not found exactly)")
+        return None
+    node['parameters']['text'] = new_prompt
+    return f"Prompt updated ({len(prompt)} -> {len(new_prompt)} chars)"
+
+
+def edit_prompt_replace(node):
+    # find + slice instead of str.replace: one scan per needle, and no
+    # new copy of the prompt when the needle is absent
+    prompt = node['parameters']['text']
+    new_prompt = _splice(_splice(prompt, OLD_CAL, NEW_CAL), OLD_RANGE, NEW_RANGE)
+    return _set_prompt(node, prompt, new_prompt)
+
+
+def edit_prompt_splice(node):
+    prompt = node['parameters']['text']
+    s = prompt.find('CONFIDENCE CALIBRATION RULES')
+    e = prompt.find('\u2501\u2501\u2501 ANTI-BIAS CHECK')
+    if s > 0 and prompt[s:e] == SPLICE_CAL:
+        print("  Prompt calibration section already up to date")
+        return None
+    if s > 0 and e > s:
+        # s - 4: drop the "━━━ " in front of the header, SPLICE_CAL has none
+        new_prompt = _splice(prompt[:s - 4] + SPLICE_CAL + prompt[e:], OLD_RANGE, NEW_RANGE)
+    else:
+        new_prompt = prompt
+    return _set_prompt(node, prompt, new_prompt)
+
+
+def edit_blocked_hours(node):
+    code = node['parameters']['jsCode']
+    m = _BLOCKED_HOURS_RE.search(code)
+    if m is None:
+        print("  WARNING: Anti-Noise BLOCKED_HOURS_UTC not found")
+        return None
+    old_hours = [int(h) for h in re.findall(r'\d+', m.group(1))]
+    if old_hours == BLOCKED_HOURS:
+        print(f"  Anti-Noise blocked hours already {BLOCKED_HOURS}")
+        return None
+    node['parameters']['jsCode'] = code[:m.start()] + NEW_HOURS + code[m.end():]
+    return f"Anti-Noise Filter: blocked hours {old_hours} -> {BLOCKED_HOURS}"
+
+
+PROMPT_EDITS = {'replace': edit_prompt_replace, 'splice': edit_prompt_splice}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update wf01B prompt confidence rules + blocked hours")
+    parser.add_argument("--mode", choices=sorted(PROMPT_EDITS), default="splice",
+                        help="How to locate the calibration section (default: splice)")
+    args = parser.parse_args(argv)
+
+    changes = _n8n_client.edit_workflow(WF_ID, {
+        'BTC Prediction Bot': PROMPT_EDITS[args.mode],
+        'Anti-Noise Filter': edit_blocked_hours,
+    })
+    sys.exit(0 if changes else 1)
+
+
+if __name__ == "__main__":
+    main()
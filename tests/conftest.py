@@ -0,0 +1,148 @@
+"""
+Shared fixtures for the test suite.
+
+The Flask app is imported once per pytest run (session scope) and shared by
+every test that needs it — importing app.py runs all of its module-level
+work (clients, engines, thread pools, etc.).
+"""
+
+import os
+import socket
+import sys
+import pytest
+
+# ---------------------------------------------------------------------------
+# Ensure the project root is on sys.path so `import app` works regardless
+# of where pytest is invoked from.
+# ---------------------------------------------------------------------------
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Endpoints are fail-closed since v2.6.2: give the app API keys to check
+# against. Set before any test module is imported, so module-level auth
+# headers can read them back from os.environ.
+os.environ.setdefault("READ_API_KEY", "test-read-key-for-smoke-tests")
+os.environ.setdefault("BOT_API_KEY", "test-bot-key-for-smoke-tests")
+
+# Never place real orders, and skip the XGBoost model load at import: the
+# smoke tests only need /predict-xgb to answer, which it does without a model.
+# Export SKIP_MODEL_LOAD=false to run the suite against the real models.
+os.environ.setdefault("DRY_RUN", "true")
+os.environ.setdefault("SKIP_MODEL_LOAD", "true")
+# Flask testing mode is read from the env at import (app.config["TESTING"]),
+# so app.py's module-level setup already sees it.
+os.environ.setdefault("TESTING", "true")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _no_network():
+    """
+    Fail every outbound network call immediately.
+
+    Without this, calls to the dummy Supabase / Kraken / Binance hosts wait on
+    DNS and connect timeouts, and app.py's urllib3 Retry adds seconds of
+    backoff per call. requests and httpx are cut at the transport, so the
+    error surfaces at once as their own ConnectionError / ConnectError;
+    anything else (urllib.request, raw sockets) is refused at connect().
+    Unix sockets stay allowed.
+    """
+    import httpx
+    import requests
+
+    def _requests_send(self, request, *args, **kwargs):
+        raise requests.exceptions.ConnectionError(f"network disabled in tests: {request.url}")
+
+    def _httpx_send(self, request):
+        raise httpx.ConnectError(f"network disabled in tests: {request.url}", request=request)
+
+    real_connect = socket.socket.connect
+
+    def _socket_connect(self, address):
+        if self.family == getattr(socket, "AF_UNIX", None):
+            return real_connect(self, address)
+        raise OSError(f"network disabled in tests: {address}")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(requests.adapters.HTTPAdapter, "send", _requests_send)
+        mp.setattr(httpx.HTTPTransport, "handle_request", _httpx_send)
+        mp.setattr(socket.socket, "connect", _socket_connect)
+        yield
+
+
+@pytest.fixture(scope="session")
+def flask_app():
+    """
+    The imported app.py module, shared by the whole run.
+
+    If the import fails every test using it is skipped with a clear message
+    rather than crashing the test suite.
+    """
+    try:
+        import app  # noqa: PLC0415
+    except Exception as exc:
+        pytest.skip(f"Could not import app.py: {exc}")
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(flask_app):
+    """Flask test client for the shared app."""
+    with flask_app.app.test_client() as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def get_cached(client):
+    """
+    get(path) -> (status code, parsed JSON or None), one real GET per path per run.
+
+    For idempotent, unauthenticated endpoints asserted by several tests
+    (/health): later tests read the memoized result instead of re-running
+    the view.
+    """
+    cache = {}
+
+    def get(path):
+        if path not in cache:
+            response = client.get(path)
+            cache[path] = (response.status_code, response.get_json())
+        return cache[path]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def wsgi_status(flask_app):
+    """
+    status(method, path, json=None, headers=None, data=None, content_type=None) -> int,
+    for status-only probes.
+
+    Calls app.wsgi_app straight with a bare environ: no test-client cookie
+    jar, redirect handling or Response wrapper. GETs without headers reuse one
+    prebuilt environ; the response body is drained and discarded. Tests that
+    parse the JSON body keep using `client`.
+    """
+    from werkzeug.test import EnvironBuilder
+
+    wsgi_app = flask_app.app.wsgi_app
+    base_get = EnvironBuilder(method="GET").get_environ()
+
+    def status(method, path, json=None, headers=None, data=None, content_type=None):
+        if method == "GET" and json is None and headers is None and data is None:
+            environ = dict(base_get)
+            environ["PATH_INFO"], _, environ["QUERY_STRING"] = path.partition("?")
+        else:
+            environ = EnvironBuilder(path=path, method=method, json=json, headers=headers,
+                                     data=data, content_type=content_type).get_environ()
+        started = []
+        body = wsgi_app(environ, lambda status_line, _headers, _exc=None: started.append(status_line))
+        try:
+            for _ in body:
+                pass
+        finally:
+            if hasattr(body, "close"):
+                body.close()
+        return int(started[0][:3])
+
+    return status
@@ -8,117 +8,100 @@ gracefully in CI where only dummy env vars are present.
 """
 
 import os
-import sys
 import pytest
 
-# ---------------------------------------------------------------------------
-# Ensure the project root is on sys.path so `import app` works regardless
-# of where pytest is invoked from.
-# ---------------------------------------------------------------------------
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+try:
+    import orjson
+
+    def _json(response):
+        """Parsed JSON body, or None if the response is not JSON (like get_json())."""
+        return orjson.loads(response.get_data()) if response.is_json else None
+except ImportError:
+    def _json(response):
+        return response.get_json()
 
 
 # ---------------------------------------------------------------------------
-# Fixture: Flask test client
+# Fixtures: `flask_app` and `client` live in tests/conftest.py (session scope,
+# so app.py is imported once per pytest run).
 # ---------------------------------------------------------------------------
 
-_TEST_READ_KEY = "test-read-key-for-smoke-tests"
-_TEST_BOT_KEY = "test-bot-key-for-smoke-tests"
+# Auth headers for convenience (keys are set by conftest.py)
+_READ_HEADERS = {"X-API-Key": os.environ["READ_API_KEY"]}
+_BOT_HEADERS = {"X-API-Key": os.environ["BOT_API_KEY"]}
 
-# Auth headers for convenience
-_READ_HEADERS = {"X-API-Key": _TEST_READ_KEY}
-_BOT_HEADERS = {"X-API-Key": _TEST_BOT_KEY}
+# Static JSON bodies, already encoded: posted with data=... + _JSON
+_JSON = "application/json"
+_BODY_SIDEWAYS = b'{"direction": "SIDEWAYS", "confidence": 0.70}'
+_BODY_CLOSE = b'{"symbol": "PF_XBTUSD"}'
+_BODY_EMPTY_TEXT = b'{"text": ""}'
+_BODY_BET_ID_ONLY = b'{"bet_id": 1}'  # missing required fields
 
+_PREDICT_XGB_URL = "/predict-xgb?rsi14=55&ema_trend=1&fear_greed=45&conf=0.70"
 
-@pytest.fixture(scope="module")
-def client():
-    """
-    Import app and return a Flask test client.
 
-    The import itself exercises all module-level code in app.py (XGBoost
-    model loading, etc.).  If the import fails the whole module is skipped
-    with a clear message rather than crashing the test suite.
-
-    Sets READ_API_KEY and BOT_API_KEY so endpoints pass auth (fail-closed since v2.6.2).
+@pytest.fixture(scope="session", autouse=True)
+def _warmup(get_cached, client):
     """
-    os.environ.setdefault("READ_API_KEY", _TEST_READ_KEY)
-    os.environ.setdefault("BOT_API_KEY", _TEST_BOT_KEY)
-    try:
-        import app as flask_app  # noqa: PLC0415
-    except Exception as exc:
-        pytest.skip(f"Could not import app.py: {exc}")
-
-    flask_app.app.config["TESTING"] = True
-    with flask_app.app.test_client() as test_client:
-        yield test_client
+    Pay first-request costs (lazy imports, JSON provider, XGB gate path) once,
+    before the first smoke test, so `pytest --durations` shows steady-state
+    per-test time. Defined here, not in conftest.py, so unit-test-only runs
+    don't import app.py.
+    """
+    get_cached("/health")
+    client.get(_PREDICT_XGB_URL, headers=_BOT_HEADERS)
 
 
 # ---------------------------------------------------------------------------
 # Test 1: Flask app object is created correctly
 # ---------------------------------------------------------------------------
 
-def test_app_is_flask_instance():
+def test_app_is_flask_instance(flask_app):
     """app.py must expose a Flask application object named `app`."""
-    try:
-        from flask import Flask
-        import app as flask_app
-        assert isinstance(flask_app.app, Flask), (
-            "flask_app.app is not a Flask instance"
-        )
-    except ImportError as exc:
-        pytest.skip(f"Import failed: {exc}")
+    from flask import Flask
+    assert isinstance(flask_app.app, Flask), (
+        "flask_app.app is not a Flask instance"
+    )
 
 
 # ---------------------------------------------------------------------------
 # Test 2: /health returns 200 and expected keys
 # ---------------------------------------------------------------------------
 
-def test_health_endpoint_returns_200(client):
+def test_health_endpoint_returns_200(get_cached):
     """/health must respond 200 even with dummy credentials (DRY_RUN=true)."""
-    response = client.get("/health")
-    assert response.status_code == 200, (
-        f"/health returned {response.status_code}: {response.data}"
-    )
+    status, data = get_cached("/health")
+    assert status == 200, f"/health returned {status}: {data}"
 
 
-def test_health_response_is_json(client):
+def test_health_response_is_json(get_cached):
     """/health must return a JSON body."""
-    response = client.get("/health")
-    data = response.get_json()
+    _, data = get_cached("/health")
     assert data is not None, "/health did not return valid JSON"
 
 
-def test_health_contains_version(client):
+def test_health_contains_version(get_cached):
     """/health JSON should include a `version` key."""
-    response = client.get("/health")
-    data = response.get_json()
-    if data is None:
-        pytest.skip("/health did not return JSON")
-    assert "version" in data, f"Missing 'version' in /health response: {data}"
+    _, data = get_cached("/health")
+    assert data and "version" in data, f"Missing 'version' in /health response: {data}"
 
 
-def test_health_contains_dry_run(client):
+def test_health_contains_dry_run(get_cached):
     """/health JSON should include a `dry_run` field."""
-    response = client.get("/health")
-    data = response.get_json()
-    if data is None:
-        pytest.skip("/health did not return JSON")
-    assert "dry_run" in data, f"Missing 'dry_run' in /health response: {data}"
+    _, data = get_cached("/health")
+    assert data and "dry_run" in data, f"Missing 'dry_run' in /health response: {data}"
 
 
 # ---------------------------------------------------------------------------
 # Test 3: /bet-sizing returns sensible output without real DB
 # ---------------------------------------------------------------------------
 
-def test_bet_sizing_returns_200(client):
+def test_bet_sizing_returns_200(wsgi_status):
     """/bet-sizing should respond 200 with default params."""
-    response = client.get("/bet-sizing?confidence=0.70", headers=_READ_HEADERS)
-    # Accept 200 or 503 (if Supabase dummy creds cause connection error)
-    assert response.status_code in (200, 503), (
-        f"/bet-sizing returned unexpected status {response.status_code}"
-    )
+    status = wsgi_status("GET", "/bet-sizing?confidence=0.70", headers=_READ_HEADERS)
+    # Network is off in tests (conftest.py): the Supabase lookup fails fast
+    # and /bet-sizing falls back to the base size
+    assert status == 200, f"/bet-sizing returned unexpected status {status}"
 
 
 # ---------------------------------------------------------------------------
@@ -127,15 +110,12 @@ def test_bet_sizing_returns_200(client):
 
 def test_predict_xgb_endpoint_exists(client):
     """/predict-xgb must exist. Returns 503 if READ_API_KEY not set (fail-closed), 200 otherwise."""
-    response = client.get(
-        "/predict-xgb?rsi14=55&ema_trend=1&fear_greed=45&conf=0.70",
-        headers=_BOT_HEADERS,
-    )
+    response = client.get(_PREDICT_XGB_URL, headers=_BOT_HEADERS)
     assert response.status_code in (200, 503), (
         f"/predict-xgb returned {response.status_code}"
     )
     if response.status_code == 200:
-        data = response.get_json()
+        data = _json(response)
         assert data is not None, "/predict-xgb did not return JSON"
         assert "agree" in data, f"Missing 'agree' in /predict-xgb response: {data}"
 
@@ -144,46 +124,35 @@ def test_predict_xgb_endpoint_exists(client):
 # Test 5: /dashboard serves index.html (static file)
 # ---------------------------------------------------------------------------
 
-def test_dashboard_returns_html(client):
+def test_dashboard_returns_html(wsgi_status):
     """/dashboard should return the HTML dashboard."""
-    response = client.get("/dashboard")
+    status = wsgi_status("GET", "/dashboard")
     # Accept 200 or 404 depending on whether index.html is present in CI
-    assert response.status_code in (200, 404), (
-        f"/dashboard returned unexpected status {response.status_code}"
-    )
+    assert status in (200, 404), f"/dashboard returned unexpected status {status}"
 
 
 # ---------------------------------------------------------------------------
 # Test 6: Unknown routes return 404 (Flask default behaviour)
 # ---------------------------------------------------------------------------
 
-def test_unknown_route_returns_404(client):
+def test_unknown_route_returns_404(wsgi_status):
     """Requests to non-existent routes must return 404."""
-    response = client.get("/this-route-does-not-exist-xyz")
-    assert response.status_code == 404
+    assert wsgi_status("GET", "/this-route-does-not-exist-xyz") == 404
 
 
 # ---------------------------------------------------------------------------
 # Test 7: POST /place-bet — DRY_RUN tests
 # ---------------------------------------------------------------------------
 
-def test_place_bet_requires_api_key(client):
-    """POST /place-bet must reject requests without valid API key."""
-    response = client.post("/place-bet", json={"direction": "UP", "confidence": 0.70})
-    # 401 if BOT_API_KEY is set, or continues if not set (backwards compat)
-    assert response.status_code in (200, 401, 429), (
-        f"/place-bet returned unexpected {response.status_code}"
-    )
-
-
 def test_place_bet_invalid_direction(client):
     """POST /place-bet must reject invalid direction."""
     response = client.post(
         "/place-bet",
-        json={"direction": "SIDEWAYS", "confidence": 0.70},
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
+        data=_BODY_SIDEWAYS,
+        content_type=_JSON,
+        headers=_BOT_HEADERS,
     )
-    data = response.get_json()
+    data = _json(response)
     if response.status_code == 401:
         pytest.skip("BOT_API_KEY mismatch — cannot test further")
     assert data is not None
@@ -192,56 +161,37 @@ def test_place_bet_invalid_direction(client):
         assert "invalid_direction" in str(data)
 
 
-def test_place_bet_empty_body(client):
+def test_place_bet_empty_body(wsgi_status):
     """POST /place-bet with empty body should return 400 or auth error."""
-    response = client.post(
-        "/place-bet",
-        data=b"{}",
-        content_type="application/json",
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
-    )
+    status = wsgi_status("POST", "/place-bet", data=b"{}", content_type=_JSON,
+                         headers=_BOT_HEADERS)
     # Empty body → direction missing → 400, or 401 if key mismatch
-    assert response.status_code in (400, 401, 429), (
-        f"Empty body /place-bet returned {response.status_code}"
-    )
+    assert status in (400, 401, 429), f"Empty body /place-bet returned {status}"
 
 
-def test_place_bet_malformed_json(client):
+def test_place_bet_malformed_json(wsgi_status):
     """POST /place-bet with malformed JSON should not crash."""
-    response = client.post(
-        "/place-bet",
-        data=b"not-valid-json{{{",
-        content_type="application/json",
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
-    )
+    status = wsgi_status("POST", "/place-bet", data=b"not-valid-json{{{", content_type=_JSON,
+                         headers=_BOT_HEADERS)
     # Flask force=True in get_json should handle this gracefully
-    assert response.status_code in (400, 401, 429, 200), (
-        f"Malformed JSON /place-bet returned {response.status_code}"
-    )
+    assert status in (400, 401, 429, 200), f"Malformed JSON /place-bet returned {status}"
 
 
 # ---------------------------------------------------------------------------
 # Test 8: POST /close-position
 # ---------------------------------------------------------------------------
 
-def test_close_position_requires_api_key(client):
-    """POST /close-position must reject without API key or proceed in DRY_RUN."""
-    response = client.post("/close-position", json={"symbol": "PF_XBTUSD"})
-    assert response.status_code in (200, 401, 429), (
-        f"/close-position returned unexpected {response.status_code}"
-    )
-
-
 def test_close_position_dry_run(client):
     """POST /close-position in DRY_RUN should return clean response."""
     response = client.post(
         "/close-position",
-        json={"symbol": "PF_XBTUSD"},
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
+        data=_BODY_CLOSE,
+        content_type=_JSON,
+        headers=_BOT_HEADERS,
     )
     if response.status_code == 401:
         pytest.skip("BOT_API_KEY mismatch")
-    data = response.get_json()
+    data = _json(response)
     assert data is not None
     # In DRY_RUN: {"status": "closed", "dry_run": true}
     # Without DRY_RUN: may error (no Kraken creds) → 500
@@ -249,259 +199,163 @@ def test_close_position_dry_run(client):
 
 
 # ---------------------------------------------------------------------------
-# Test 9: POST /cockpit/api/auth
-# ---------------------------------------------------------------------------
-
-def test_cockpit_auth_no_token(client):
-    """POST /cockpit/api/auth with empty token should return 403 or 503."""
-    response = client.post(
-        "/cockpit/api/auth",
-        json={"token": ""},
-    )
-    # 403 if COCKPIT_TOKEN set (wrong token), 503 if not configured
-    assert response.status_code in (403, 503), (
-        f"/cockpit/api/auth returned {response.status_code}"
-    )
-
-
-def test_cockpit_auth_wrong_token(client):
-    """POST /cockpit/api/auth with wrong token should return 403 or 503."""
-    response = client.post(
-        "/cockpit/api/auth",
-        json={"token": "definitely-wrong-token-12345"},
-    )
-    assert response.status_code in (403, 503)
-
-
-# ---------------------------------------------------------------------------
-# Test 10: POST /cockpit/api/bot-toggle
+# Test 9: POSTs without auth / with invalid input are rejected
 # ---------------------------------------------------------------------------
 
-def test_cockpit_bot_toggle_no_auth(client):
-    """POST /cockpit/api/bot-toggle without auth should be rejected."""
-    response = client.post("/cockpit/api/bot-toggle")
-    assert response.status_code in (403, 503)
+# (path, JSON body, accepted status codes). One test walks the whole table:
+# these probes differ only in data, so they share one item's setup/report.
+REJECTED_POSTS = [
+    # /place-bet, /close-position: 401 if BOT_API_KEY is set, else continues (backwards compat)
+    ("/place-bet", {"direction": "UP", "confidence": 0.70}, (200, 401, 429)),
+    ("/close-position", {"symbol": "PF_XBTUSD"}, (200, 401, 429)),
+    # cockpit: 403 if COCKPIT_TOKEN set (wrong/no token), 503 if not configured
+    ("/cockpit/api/auth", {"token": ""}, (403, 503)),
+    ("/cockpit/api/auth", {"token": "definitely-wrong-token-12345"}, (403, 503)),
+    ("/publish-telegram", {"text": "test"}, (401, 429)),
+    ("/ghost-evaluate", None, (401, 503)),
+    ("/rescue-orphaned", None, (401, 503)),
+    ("/commit-prediction", {}, (400, 401)),
+    # public forms: 400 (invalid input) or captcha / rate-limit block
+    ("/submit-contribution", {"role": "trader", "insight": "", "consent": True}, (400, 429)),
+    ("/submit-contribution",
+     {"role": "trader", "insight": "This is a valid insight with enough chars", "consent": False},
+     (400, 429)),
+    ("/satoshi-lead", {"email": "not-an-email"}, (400, 429)),
+]
 
 
-# ---------------------------------------------------------------------------
-# Test 11: POST /cockpit/api/agents/reset
-# ---------------------------------------------------------------------------
+def test_rejected_posts(wsgi_status):
+    """Unauthenticated or invalid POSTs must be rejected, never served."""
+    failures = []
+    for path, body, allowed in REJECTED_POSTS:
+        status = wsgi_status("POST", path, json=body)
+        if status not in allowed:
+            failures.append(f"{path} {body}: {status} not in {allowed}")
+    assert not failures, "\n".join(failures)
 
-def test_cockpit_agents_reset_no_auth(client):
-    """POST /cockpit/api/agents/reset without auth should be rejected."""
-    response = client.post(
-        "/cockpit/api/agents/reset",
-        json={"clone_id": "c1"},
-    )
-    assert response.status_code in (403, 503)
 
-
-# ---------------------------------------------------------------------------
-# Test 12: POST /cockpit/api/agents/update
-# ---------------------------------------------------------------------------
-
-def test_cockpit_agents_update_no_auth(client):
-    """POST /cockpit/api/agents/update without auth should be rejected."""
-    response = client.post(
-        "/cockpit/api/agents/update",
-        json={"clone_id": "c1", "action": "note", "value": "test"},
-    )
-    assert response.status_code in (403, 503)
+@pytest.mark.parametrize("path,body", [
+    ("/cockpit/api/bot-toggle", None),
+    ("/cockpit/api/agents/reset", {"clone_id": "c1"}),
+    ("/cockpit/api/agents/update", {"clone_id": "c1", "action": "note", "value": "test"}),
+    ("/cockpit/api/log/ingest", {"source": "test", "level": "info", "title": "test"}),
+], ids=["bot_toggle", "agents_reset", "agents_update", "log_ingest"])
+def test_cockpit_no_auth_rejected(wsgi_status, path, body):
+    """Cockpit write endpoints without a session must be rejected (403, or 503 if not configured)."""
+    status = wsgi_status("POST", path, json=body)
+    assert status in (403, 503), f"{path} returned {status}"
 
 
 # ---------------------------------------------------------------------------
-# Test 13: POST /cockpit/api/log/ingest
+# Test 10: POST /publish-telegram
 # ---------------------------------------------------------------------------
 
-def test_cockpit_log_ingest_no_auth(client):
-    """POST /cockpit/api/log/ingest without auth should be rejected."""
-    response = client.post(
-        "/cockpit/api/log/ingest",
-        json={"source": "test", "level": "info", "title": "test"},
-    )
-    assert response.status_code in (403, 503)
-
-
-# ---------------------------------------------------------------------------
-# Test 14: POST /publish-telegram
-# ---------------------------------------------------------------------------
-
-def test_publish_telegram_requires_api_key(client):
-    """POST /publish-telegram must reject without API key."""
-    response = client.post("/publish-telegram", json={"text": "test"})
-    assert response.status_code in (401, 429), (
-        f"/publish-telegram returned {response.status_code}"
-    )
-
-
 def test_publish_telegram_empty_text(client):
     """POST /publish-telegram with empty text should return 400."""
     response = client.post(
         "/publish-telegram",
-        json={"text": ""},
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
+        data=_BODY_EMPTY_TEXT,
+        content_type=_JSON,
+        headers=_BOT_HEADERS,
     )
     if response.status_code == 401:
         pytest.skip("BOT_API_KEY mismatch")
-    data = response.get_json()
+    data = _json(response)
     assert data is not None
     if response.status_code == 400:
         assert "text required" in str(data.get("error", ""))
 
 
 # ---------------------------------------------------------------------------
-# Test 15: POST /pause and /resume
+# Test 11: POST /pause and /resume
+# Tests that touch shared app state share one xdist group → same worker,
+# run in order (pytest -n auto --dist loadgroup); the rest fan out.
 # ---------------------------------------------------------------------------
 
-def test_pause_requires_api_key(client):
+@pytest.mark.xdist_group("stateful")
+def test_pause_requires_api_key(wsgi_status):
     """POST /pause must reject without valid API key."""
-    response = client.post("/pause")
-    assert response.status_code in (200, 401)
+    assert wsgi_status("POST", "/pause") in (200, 401)
 
 
-def test_resume_requires_api_key(client):
+@pytest.mark.xdist_group("stateful")
+def test_resume_requires_api_key(wsgi_status):
     """POST /resume must reject without valid API key."""
-    response = client.post("/resume")
-    assert response.status_code in (200, 401)
-
-
-# ---------------------------------------------------------------------------
-# Test 16: POST /ghost-evaluate
-# ---------------------------------------------------------------------------
-
-def test_ghost_evaluate_requires_api_key(client):
-    """POST /ghost-evaluate must reject without API key."""
-    response = client.post("/ghost-evaluate")
-    assert response.status_code in (401, 503), (
-        f"/ghost-evaluate returned {response.status_code}"
-    )
+    assert wsgi_status("POST", "/resume") in (200, 401)
 
 
 # ---------------------------------------------------------------------------
-# Test 17: POST /rescue-orphaned
-# ---------------------------------------------------------------------------
-
-def test_rescue_orphaned_requires_api_key(client):
-    """POST /rescue-orphaned must reject without API key."""
-    response = client.post("/rescue-orphaned")
-    assert response.status_code in (401, 503), (
-        f"/rescue-orphaned returned {response.status_code}"
-    )
-
-
-# ---------------------------------------------------------------------------
-# Test 18: POST /commit-prediction (on-chain)
+# Test 12: POST /commit-prediction (on-chain)
 # ---------------------------------------------------------------------------
 
 def test_commit_prediction_missing_fields(client):
     """POST /commit-prediction with missing fields should return 400."""
     response = client.post(
         "/commit-prediction",
-        json={"bet_id": 1},  # missing required fields
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
+        data=_BODY_BET_ID_ONLY,
+        content_type=_JSON,
+        headers=_BOT_HEADERS,
     )
     if response.status_code == 401:
         pytest.skip("BOT_API_KEY mismatch")
     assert response.status_code == 400
-    data = response.get_json()
+    data = _json(response)
     assert "Campi mancanti" in str(data.get("error", ""))
 
 
-def test_commit_prediction_requires_api_key(client):
-    """POST /commit-prediction must reject without API key."""
-    response = client.post("/commit-prediction", json={})
-    assert response.status_code in (400, 401)
-
-
 # ---------------------------------------------------------------------------
-# Test 19: POST /resolve-prediction (on-chain)
+# Test 13: POST /resolve-prediction (on-chain)
 # ---------------------------------------------------------------------------
 
-def test_resolve_prediction_missing_fields(client):
+def test_resolve_prediction_missing_fields(wsgi_status):
     """POST /resolve-prediction with missing fields should return 400."""
-    response = client.post(
-        "/resolve-prediction",
-        json={"bet_id": 1},
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
-    )
-    if response.status_code == 401:
+    status = wsgi_status("POST", "/resolve-prediction", data=_BODY_BET_ID_ONLY,
+                         content_type=_JSON, headers=_BOT_HEADERS)
+    if status == 401:
         pytest.skip("BOT_API_KEY mismatch")
-    assert response.status_code == 400
-
-
-# ---------------------------------------------------------------------------
-# Test 20: POST /submit-contribution (public, no API key)
-# ---------------------------------------------------------------------------
-
-def test_submit_contribution_empty_insight(client):
-    """POST /submit-contribution with empty insight should return 400."""
-    response = client.post(
-        "/submit-contribution",
-        json={"role": "trader", "insight": "", "consent": True},
-    )
-    # 400 (too short) or recaptcha block
-    assert response.status_code in (400, 429)
-
-
-def test_submit_contribution_no_consent(client):
-    """POST /submit-contribution without consent should return 400."""
-    response = client.post(
-        "/submit-contribution",
-        json={"role": "trader", "insight": "This is a valid insight with enough chars", "consent": False},
-    )
-    assert response.status_code in (400, 429)
+    assert status == 400
 
 
 # ---------------------------------------------------------------------------
-# Test 21: POST /satoshi-lead
+# Test 14: Edge cases — content type and API key validation
 # ---------------------------------------------------------------------------
 
-def test_satoshi_lead_invalid_email(client):
-    """POST /satoshi-lead with invalid email should return 400."""
-    response = client.post(
-        "/satoshi-lead",
-        json={"email": "not-an-email"},
-    )
-    # 400 (invalid_email) or captcha block
-    assert response.status_code in (400, 429)
-
-
-# ---------------------------------------------------------------------------
-# Test 22: Edge cases — content type and API key validation
-# ---------------------------------------------------------------------------
-
-def test_place_bet_missing_content_type(client):
+def test_place_bet_missing_content_type(wsgi_status):
     """POST /place-bet without Content-Type should still work (force=True)."""
-    response = client.post(
-        "/place-bet",
-        data=b'{"direction":"UP","confidence":0.7}',
-        headers={"X-API-Key": os.environ.get("BOT_API_KEY", "test")},
-    )
+    status = wsgi_status("POST", "/place-bet", data=b'{"direction":"UP","confidence":0.7}',
+                         headers=_BOT_HEADERS)
     # Should not crash — get_json(force=True) handles this
-    assert response.status_code in (200, 400, 401, 429, 500)
+    assert status in (200, 400, 401, 429, 500)
 
 
 # ---------------------------------------------------------------------------
-# Test 23: GET endpoints that should work without auth
+# Test 15: GET endpoints that should work without auth
 # ---------------------------------------------------------------------------
 
 def test_public_contributions_returns_json(client):
     """/public-contributions should return a JSON array."""
     response = client.get("/public-contributions")
     assert response.status_code == 200
-    data = response.get_json()
+    data = _json(response)
     assert isinstance(data, list)
 
 
 def test_btc_regime_returns_json(client):
     """/btc-regime should return regime data."""
     response = client.get("/btc-regime", headers=_BOT_HEADERS)
-    # May fail if Binance API is unreachable
-    assert response.status_code in (200, 500)
+    # Network is off in tests (conftest.py): every source fails and the
+    # endpoint answers with its default regime
+    assert response.status_code == 200
+    assert "regime_label" in _json(response)
 
 
-def test_force_retrain_rate_limited(client):
+@pytest.mark.xdist_group("stateful")
+def test_force_retrain_rate_limited(client, flask_app, monkeypatch):
     """/force-retrain should enforce rate limiting."""
+    # Only the rate limiter is under test: stub the refresh work the first
+    # call would kick off (Supabase fetch + global threshold rewrite)
+    monkeypatch.setattr(flask_app, "refresh_calibration", lambda: None)
+    monkeypatch.setattr(flask_app, "refresh_dead_hours", lambda: None)
     # First call may succeed or fail based on state
     client.post("/force-retrain", headers=_BOT_HEADERS)
     # Second call within 1h should be rate-limited
@@ -0,0 +1,89 @@
+"""
+Unit tests for the correctness-model Platt calibration (train_xgboost.py).
+
+The (a, b) stored in model_metadata.json must be fitted on the logits of the
+same model that is pickled as xgb_correctness.pkl. Synthetic data, no network.
+"""
+
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+train_xgboost = pytest.importorskip("train_xgboost")
+
+from sklearn.linear_model import LogisticRegression
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+_FEATURES = ["f1", "f2", "f3"]
+
+
+def _df(n=200, seed=7):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(_FEATURES)))
+    noise = rng.normal(scale=1.0, size=n)
+    df = pd.DataFrame(X, columns=_FEATURES)
+    df["label"] = (X[:, 0] + 0.5 * X[:, 1] + noise > 0).astype(int)
+    df["created_at"] = pd.date_range("2026-01-01", periods=n, freq="h")
+    return df
+
+
+def _refit_platt(model, cal_df):
+    """Refit the sigmoid on `model`'s logits over the calibration slice."""
+    p = model.predict_proba(cal_df[_FEATURES].values)[:, 1].clip(1e-6, 1 - 1e-6)
+    logit = np.log(p / (1 - p)).reshape(-1, 1)
+    lr = LogisticRegression(C=1e6).fit(logit, cal_df["label"].values)
+    return float(lr.coef_[0][0]), float(lr.intercept_[0])
+
+
+# ── fit_platt ─────────────────────────────────────────────────────────────────
+
+def test_fit_platt_returns_model_matching_coefficients():
+    df = _df()
+    platt, model = train_xgboost.fit_platt(df, _FEATURES, train_xgboost.Reporter())
+    assert platt is not None and model is not None
+    cal_df = df.iloc[-platt["n_calib"]:]
+    a, b = _refit_platt(model, cal_df)
+    assert a == pytest.approx(platt["a"], abs=1e-4)
+    assert b == pytest.approx(platt["b"], abs=1e-4)
+
+
+def test_fit_platt_skips_tiny_slice():
+    platt, model = train_xgboost.fit_platt(_df(n=40), _FEATURES, train_xgboost.Reporter())
+    assert platt is None and model is None
+
+
+# ── save_models ───────────────────────────────────────────────────────────────
+
+def test_persisted_model_and_platt_come_from_same_fit(tmp_path, monkeypatch):
+    """The pickled correctness model reproduces the (a, b) written to metadata."""
+    (tmp_path / "models").mkdir()
+    monkeypatch.setattr(train_xgboost, "_MODELS_DIR", str(tmp_path / "models"))
+    df = _df()
+    X, y = df[_FEATURES].values, df["label"].values
+    res_dir = train_xgboost.train_and_eval(X, y, "Direction")
+    res_corr = train_xgboost.train_and_eval(X, y, "Correctness")
+    platt, calib_model = train_xgboost.fit_platt(df, _FEATURES, train_xgboost.Reporter())
+    res_corr["model"] = calib_model  # as in main()
+
+    train_xgboost.save_models(res_dir, res_corr, train_xgboost.Reporter(), str(tmp_path),
+                              n_samples=len(df), feature_names=_FEATURES, platt=platt)
+
+    with open(tmp_path / "models" / "xgb_correctness.pkl", "rb") as f:
+        served = pickle.load(f)
+    with open(tmp_path / "models" / "model_metadata.json", encoding="utf-8") as f:
+        stored = json.load(f)["correctness_platt"]
+
+    a, b = _refit_platt(served, df.iloc[-stored["n_calib"]:])
+    assert a == pytest.approx(stored["a"], abs=1e-4)
+    assert b == pytest.approx(stored["b"], abs=1e-4)
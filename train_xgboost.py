@@ -26,10 +26,12 @@ import datetime
 import shutil
 
 import requests
+import numpy as np
 import pandas as pd
 from xgboost import XGBClassifier
 from sklearn.model_selection import TimeSeriesSplit, cross_val_score
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
+from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, brier_score_loss
+from sklearn.linear_model import LogisticRegression
 from constants import XGB_PARAMS
 
 # ─── Features usate per la predizione ─────────────────────────────────────────
@@ -189,6 +191,46 @@ def train_and_eval(X, y, label_name: str) -> dict:
     return {"model": model, "cv_acc": cv_acc, "cv_auc": cv_auc}
 
 
+# ─── Calibrazione Platt (correctness model) ───────────────────────────────────
+CALIB_FRACTION = 0.20   # ultimo 20% cronologico = slice di calibrazione held-out
+CALIB_MIN_ROWS = 20
+
+
+def fit_platt(df_clean: pd.DataFrame, feature_cols: list, log: Reporter):
+    """Platt scaling per P(CORRECT): p' = sigmoid(a * logit(p) + b).
+
+    XGB fittato sul primo 80% cronologico, sigmoid fittata sul 20% finale mai
+    visto dal modello. Isotonic NON usata: con poche centinaia di righe
+    sovra-adatta la coda e peggiora il rischio sulle soglie del gate.
+    Ritorna (platt, model): (a, b) valgono SOLO per questo model, che va quindi
+    servito come xgb_correctness.pkl. (None, None) se lo slice è troppo
+    piccolo/monoclasse.
+    """
+    print_section("CALIBRAZIONE — Platt scaling correctness model")
+    df_s = df_clean.sort_values("created_at") if "created_at" in df_clean.columns else df_clean
+    n_calib = int(len(df_s) * CALIB_FRACTION)
+    fit_df, cal_df = df_s.iloc[:-n_calib], df_s.iloc[-n_calib:]
+    y_cal = cal_df["label"].values
+    if n_calib < CALIB_MIN_ROWS or len(set(y_cal)) < 2 or fit_df["label"].nunique() < 2:
+        log(f"  ⚠️  Slice di calibrazione inutilizzabile ({n_calib} righe) — Platt saltato, prob raw")
+        return None, None
+
+    model = XGBClassifier(**XGB_PARAMS).fit(fit_df[feature_cols].values, fit_df["label"].values)
+    p_raw = model.predict_proba(cal_df[feature_cols].values)[:, 1].clip(1e-6, 1 - 1e-6)
+    logit = np.log(p_raw / (1 - p_raw)).reshape(-1, 1)
+    lr = LogisticRegression(C=1e6).fit(logit, y_cal)
+    a, b = float(lr.coef_[0][0]), float(lr.intercept_[0])
+    p_cal = lr.predict_proba(logit)[:, 1]
+
+    brier_raw, brier_cal = brier_score_loss(y_cal, p_raw), brier_score_loss(y_cal, p_cal)
+    log(f"  Slice calibrazione: {n_calib} righe (fit su {len(fit_df)})")
+    log(f"  Platt a={a:.4f}  b={b:.4f}")
+    log(f"  Brier raw {brier_raw:.4f} → Platt {brier_cal:.4f}")
+    platt = {"a": round(a, 6), "b": round(b, 6), "n_calib": n_calib,
+             "brier_raw": round(float(brier_raw), 4), "brier_platt": round(float(brier_cal), 4)}
+    return platt, model
+
+
 # ─── Walkforward validation ───────────────────────────────────────────────────
 def run_walkforward(df_clean: pd.DataFrame, feature_cols: list,
                     res_dir: dict, res_corr: dict, log: Reporter):
@@ -371,7 +413,7 @@ def _archive_model(src_path: str, archive_dir: str, stamp: str, basename: str):
 
 
 def save_model_metadata(n_samples: int, feature_names: list,
-                         res_dir: dict, res_corr: dict, stamp: str):
+                         res_dir: dict, res_corr: dict, stamp: str, platt: dict = None):
     """Task 5.3: Scrive models/model_metadata.json."""
     os.makedirs(_MODELS_DIR, exist_ok=True)
     metadata = {
@@ -384,6 +426,8 @@ def save_model_metadata(n_samples: int, feature_names: list,
         "direction_cv_auc":       round(float(res_dir["cv_auc"].mean()),  4),
         "correctness_cv_accuracy": round(float(res_corr["cv_acc"].mean()), 4),
         "correctness_cv_auc":      round(float(res_corr["cv_auc"].mean()), 4),
+        # Platt (a, b) per P(CORRECT) — applicato da app.py; None = prob raw
+        "correctness_platt": platt,
     }
     meta_path = os.path.join(_MODELS_DIR, "model_metadata.json")
     with open(meta_path, "w", encoding="utf-8") as f:
@@ -393,7 +437,8 @@ def save_model_metadata(n_samples: int, feature_names: list,
 
 # ─── Save ─────────────────────────────────────────────────────────────────────
 def save_models(res_dir: dict, res_corr: dict, report: Reporter,
-                output_dir: str, n_samples: int = 0, feature_names: list = None):
+                output_dir: str, n_samples: int = 0, feature_names: list = None,
+                platt: dict = None):
     dir_path  = os.path.join(output_dir, "xgb_direction.pkl")
     corr_path = os.path.join(output_dir, "xgb_correctness.pkl")
     rep_path  = os.path.join(output_dir, "xgb_report.txt")
@@ -424,6 +469,7 @@ def save_models(res_dir: dict, res_corr: dict, report: Reporter,
         res_dir=res_dir,
         res_corr=res_corr,
         stamp=stamp,
+        platt=platt,
     )
     print(f"  {meta_path}")
     print(f"  {archive_dir}/*_{stamp}.pkl (archivio versione)")
@@ -535,6 +581,11 @@ def main():
     log("  Dati le stesse features, il segnale LLM sarà corretto?")
     log("  Utile come filtro di qualità: bet solo se XGB dice 'correct'.")
     res_corr = train_and_eval(X, y_corr, "Correctness Model")
+    platt, calib_model = fit_platt(df_clean, active_cols, log)
+    if calib_model is not None:
+        # (a, b) sono fittati sui logit del modello 80%: si serve quello, non il
+        # refit su 100% righe, altrimenti la sigmoid calibra un altro modello.
+        res_corr["model"] = calib_model
     log("\n  Feature Importance (correttezza):")
     log(feature_importance_table(res_corr["model"], active_cols))
     y_pred_corr = res_corr["model"].predict(X)
@@ -552,7 +603,7 @@ def main():
 
     # ── Save + notify ──────────────────────────────────────────────────────────
     save_models(res_dir, res_corr, log, args.output_dir,
-                n_samples=len(df_clean), feature_names=active_cols)
+                n_samples=len(df_clean), feature_names=active_cols, platt=platt)
     _notify_channel_retrain(
         n_samples=len(df_clean),
         win_rate=y_corr.mean(),